@@ -0,0 +1,14 @@
+import numpy as np
+
+
+# define a function to choose actions for a batch of states using epsilon-greedy policy
+def batchEpsilonGreedy(Q,states,epsilon,rng):
+    n=len(states)
+    # sample a probability for every lane from uniform distribution
+    prob=rng.random(n)
+    # get greedy actions of all lanes in one call
+    greedy_actions=np.argmax(Q[states,:],axis=1)
+    # pick random actions for all lanes
+    random_actions=rng.integers(0,Q.shape[1],size=n)
+    # exploit if the sampled probability is greater than epsilon otherwise explore, epsilon may be a scalar or an array per lane
+    return np.where(prob>epsilon,greedy_actions,random_actions)
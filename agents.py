@@ -0,0 +1,467 @@
+import heapq
+import numpy as np
+from episode_buffer import EpisodeBuffer
+from frozenlake_env import mapOf, randomStream
+from rng import RandomStream
+from schedules import ConstantSchedule, epsilonSchedule, alphaSchedule
+from tabular import createRandomPolicyArray, createActionValuesArray, policyCDF, sampleAction
+from training_config import TrainingConfig, DEFAULT_CONFIGS
+
+
+# the training driver only uses this interface of the agents:
+#   beginEpisode(episode)                             set the hyperparameters of the episode from the schedules
+#   act(state)                                        choose the action to take in state
+#   update(state,action,reward,next_state,done)       learn from one step
+#   endEpisode()                                      learn from the whole episode, for monte carlo
+#   greedyPolicy()                                    greedy action of every state
+#   getState(), setState(Q,state)                     arrays besides Q to save in a checkpoint between episodes
+# and the Q table in agent.Q
+
+# define a base class for tabular agents acting epsilon-greedily with respect to their Q table
+# epsilon and alpha are schedules, callables from the episode index to the value, default to the ones of config
+# rng is the random stream the agent draws from, or an int seed, a SeedSequence or a Generator to create one from
+class Agent:
+    def __init__(self,n_states,n_actions,config=None,epsilon=None,alpha=None,Q=None,terminal_states=(),rng=None):
+        if config is None:
+            config=TrainingConfig()
+        self.config=config
+        self.n_states=n_states
+        self.n_actions=n_actions
+        self.gamma=config.gamma
+        self.epsilon_schedule=epsilon if epsilon is not None else epsilonSchedule(config)
+        self.alpha_schedule=alpha if alpha is not None else alphaSchedule(config)
+        self.epsilon=self.epsilon_schedule(0)
+        self.alpha=self.alpha_schedule(0)
+        self.random=rng if isinstance(rng,RandomStream) else RandomStream(rng)
+        if Q is None:
+            Q=self.initialQ(terminal_states)
+        self.Q=Q
+
+    # define a function to initialize the Q table, small random values and 0 action values for terminal states
+    def initialQ(self,terminal_states):
+        Q=self.random.uniform(low=0.0,high=1e-3,size=(self.n_states,self.n_actions))
+        Q[list(terminal_states),:]=0.0
+        return Q
+
+    def beginEpisode(self,episode):
+        self.epsilon=self.epsilon_schedule(episode)
+        self.alpha=self.alpha_schedule(episode)
+
+    # define a function to choose an action from state using epsilon-greedy policy
+    def act(self,state):
+        # exploit if the sampled probability is greater than epsilon otherwise explore
+        if self.random.random()>self.epsilon:
+            return int(np.argmax(self.Q[state]))
+        return self.random.randrange(self.n_actions)
+
+    def update(self,state,action,reward,next_state,done):
+        raise NotImplementedError
+
+    def endEpisode(self):
+        pass
+
+    def greedyPolicy(self):
+        return np.argmax(self.Q,axis=1)
+
+    # define functions to save and restore the state of the agent between episodes, a dict of arrays besides Q
+    def getState(self):
+        return {}
+
+    def setState(self,Q,state):
+        self.Q=Q
+
+# define a class for a Q-learning agent, off-policy update towards the greedy action value of the next state
+class QLearningAgent(Agent):
+    def update(self,state,action,reward,next_state,done):
+        Q=self.Q
+        Q[state,action]+=self.alpha*(reward+self.gamma*np.max(Q[next_state])-Q[state,action])
+
+# define a class for a sarsa agent, on-policy update towards the action value of the next action
+# the next action is chosen during the update and returned by the following act call
+class SarsaAgent(Agent):
+    def __init__(self,*args,**kwargs):
+        Agent.__init__(self,*args,**kwargs)
+        self.next_action=None
+
+    def beginEpisode(self,episode):
+        Agent.beginEpisode(self,episode)
+        self.next_action=None
+
+    def act(self,state):
+        if self.next_action is not None:
+            action=self.next_action
+            self.next_action=None
+            return action
+        return Agent.act(self,state)
+
+    def update(self,state,action,reward,next_state,done):
+        # choose A' from S' using epsilon-greedy policy
+        next_action=Agent.act(self,next_state)
+        Q=self.Q
+        Q[state,action]+=self.alpha*(reward+self.gamma*Q[next_state,next_action]-Q[state,action])
+        self.next_action=next_action
+
+# define a class for an expected sarsa agent, update towards the expected action value of the next state
+# under the epsilon-greedy policy, computed in closed form instead of sampling the next action
+class ExpectedSarsaAgent(Agent):
+    def update(self,state,action,reward,next_state,done):
+        Q=self.Q
+        next_values=Q[next_state]
+        # the greedy action gets 1-epsilon on top of the epsilon/n_actions of every action
+        expected=(1.0-self.epsilon)*next_values.max()+self.epsilon*next_values.mean()
+        Q[state,action]+=self.alpha*(reward+self.gamma*expected-Q[state,action])
+
+# define a class for a double Q-learning agent, two tables QA and QB where one picks the greedy action of the next state
+# and the other evaluates it, which removes the overestimation of the max over noisy action values
+# agent.Q is kept equal to the mean of the two tables and is used to act
+class DoubleQLearningAgent(Agent):
+    def __init__(self,*args,**kwargs):
+        Agent.__init__(self,*args,**kwargs)
+        # QA and QB in one array of shape (2, states, actions), both start from the initial Q
+        self.tables=np.stack([self.Q,self.Q])
+
+    def getState(self):
+        return {'tables':self.tables}
+
+    def setState(self,Q,state):
+        Agent.setState(self,Q,state)
+        self.tables=np.array(state['tables'])
+
+    def update(self,state,action,reward,next_state,done):
+        # update QA or QB with equal probability
+        i=0 if self.random.random()<0.5 else 1
+        table=self.tables[i]
+        other=self.tables[1-i]
+        best=int(np.argmax(table[next_state]))
+        delta=self.alpha*(reward+self.gamma*other[next_state,best]-table[state,action])
+        table[state,action]+=delta
+        self.Q[state,action]+=0.5*delta
+
+# define a class to store eligibility traces sparsely, only the (s,a) visited in the episode with a trace above a threshold
+# are kept, as flat indices state*n_actions+action in a growable array with their values
+class SparseTraces:
+    def __init__(self,capacity=64):
+        self.indices=np.zeros(capacity,dtype=np.int64)
+        self.values=np.zeros(capacity)
+        self.length=0
+        # position of each index in the arrays
+        self.position={}
+
+    def clear(self):
+        self.length=0
+        self.position.clear()
+
+    def __len__(self):
+        return self.length
+
+    # define a function to set the trace of a flat index to value, replacing traces
+    def set(self,index,value=1.0):
+        i=self.position.get(index)
+        if i is None:
+            if self.length==len(self.indices):
+                self.indices=np.concatenate([self.indices,np.zeros_like(self.indices)])
+                self.values=np.concatenate([self.values,np.zeros_like(self.values)])
+            i=self.position[index]=self.length
+            self.indices[i]=index
+            self.length+=1
+        self.values[i]=value
+
+    # define a function to add step*trace to the flat array of action values, touching the stored traces only
+    def apply(self,Q_flat,step):
+        n=self.length
+        Q_flat[self.indices[:n]]+=step*self.values[:n]
+
+    # define a function to multiply all traces by factor and drop the ones below threshold
+    def decay(self,factor,threshold):
+        n=self.length
+        values=self.values[:n]
+        values*=factor
+        keep=values>=threshold
+        if not keep.all():
+            m=int(keep.sum())
+            self.indices[:m]=self.indices[:n][keep]
+            self.values[:m]=values[keep]
+            self.length=m
+            self.position={int(index):i for i,index in enumerate(self.indices[:m])}
+
+# define a class for a sarsa(lambda) agent, the td error of every step updates all (s,a) of the episode weighted by their traces
+# trace_decay is lambda, traces below min_trace are dropped so each step costs O(visited) instead of O(states*actions)
+class SarsaLambdaAgent(SarsaAgent):
+    def __init__(self,*args,trace_decay=0.9,min_trace=1e-3,**kwargs):
+        SarsaAgent.__init__(self,*args,**kwargs)
+        self.trace_decay=trace_decay
+        self.min_trace=min_trace
+        self.traces=SparseTraces()
+
+    def beginEpisode(self,episode):
+        SarsaAgent.beginEpisode(self,episode)
+        self.traces.clear()
+
+    def update(self,state,action,reward,next_state,done):
+        # choose A' from S' using epsilon-greedy policy
+        next_action=Agent.act(self,next_state)
+        Q=self.Q
+        delta=reward+self.gamma*Q[next_state,next_action]-Q[state,action]
+        self.traces.set(state*self.n_actions+action)
+        self.traces.apply(Q.reshape(-1),self.alpha*delta)
+        self.traces.decay(self.gamma*self.trace_decay,self.min_trace)
+        self.next_action=next_action
+
+# define a class for a watkins Q(lambda) agent, as sarsa(lambda) with the greedy target of Q-learning,
+# the traces are cut after an exploratory action since the later returns no longer follow the greedy policy
+class QLambdaAgent(SarsaLambdaAgent):
+    def update(self,state,action,reward,next_state,done):
+        next_action=Agent.act(self,next_state)
+        Q=self.Q
+        next_values=Q[next_state]
+        best=next_values.max()
+        # test whether A' is greedy before the update, next_values is a view of Q and changes when S' has traces
+        greedy=next_values[next_action]==best
+        delta=reward+self.gamma*best-Q[state,action]
+        self.traces.set(state*self.n_actions+action)
+        self.traces.apply(Q.reshape(-1),self.alpha*delta)
+        if greedy:
+            self.traces.decay(self.gamma*self.trace_decay,self.min_trace)
+        else:
+            self.traces.clear()
+        self.next_action=next_action
+
+# define a class for a dyna-Q agent, Q-learning that also learns a tabular model of the environment
+# and performs planning_steps simulated backups from the model after every real step
+# the model counts the observed next states of each (s,a) in arrays of shape (states, actions, max_outcomes),
+# 3 outcomes per (s,a) on the slippery FrozenLake, and a simulated backup is the expected update over the counts
+# with prioritized=True the backups are taken from a priority queue of the (s,a) whose values would change most
+# instead of uniformly from the observed ones (prioritized sweeping), theta is the smallest priority queued
+class DynaQAgent(QLearningAgent):
+    def __init__(self,*args,planning_steps=10,prioritized=False,theta=1e-4,max_outcomes=3,**kwargs):
+        QLearningAgent.__init__(self,*args,**kwargs)
+        self.planning_steps=planning_steps
+        self.prioritized=prioritized
+        self.theta=theta
+        shape=(self.n_states,self.n_actions,max_outcomes)
+        # next states, -1 for unused slots, number of times each was observed and the reward of entering it
+        self.model_next_state=np.full(shape,-1,dtype=np.int64)
+        self.model_counts=np.zeros(shape,dtype=np.int64)
+        self.model_reward=np.zeros(shape)
+        # flat indices state*n_actions+action of the observed (s,a), for uniform sampling
+        self.observed=[]
+        # observed (s,a) leading to each state, for prioritized sweeping
+        self.predecessors={}
+        # max-heap of (-priority, flat index) and the current priority of each queued (s,a)
+        self.queue=[]
+        self.priorities={}
+        # next states, probabilities and rewards of each observed (s,a) as python lists derived from the counts,
+        # and the greedy value max Q[s] of every state, for fast expected backups
+        self.transitions={}
+        self.V=self.Q.max(axis=1).tolist()
+
+    # the model and the queued priorities are saved, the python lists derived from them are rebuilt
+    def getState(self):
+        return {'model_next_state':self.model_next_state,'model_counts':self.model_counts,'model_reward':self.model_reward,
+                'observed':np.array(self.observed,dtype=np.int64),
+                'queued':np.array(list(self.priorities),dtype=np.int64),'priorities':np.array(list(self.priorities.values()))}
+
+    def setState(self,Q,state):
+        QLearningAgent.setState(self,Q,state)
+        self.model_next_state=np.array(state['model_next_state'])
+        self.model_counts=np.array(state['model_counts'])
+        self.model_reward=np.array(state['model_reward'])
+        self.observed=state['observed'].tolist()
+        self.predecessors={}
+        self.transitions={}
+        for flat_index in self.observed:
+            state_,action=divmod(flat_index,self.n_actions)
+            counts=self.model_counts[state_,action]
+            n=int((counts>0).sum())
+            for next_state in self.model_next_state[state_,action,:n].tolist():
+                self.predecessors.setdefault(next_state,set()).add(flat_index)
+            self.transitions[flat_index]=(self.model_next_state[state_,action,:n].tolist(),
+                                          (counts[:n]/counts[:n].sum()).tolist(),
+                                          self.model_reward[state_,action,:n].tolist())
+        self.priorities=dict(zip(state['queued'].tolist(),state['priorities'].tolist()))
+        self.queue=[(-priority,flat_index) for flat_index,priority in self.priorities.items()]
+        heapq.heapify(self.queue)
+        self.V=self.Q.max(axis=1).tolist()
+
+    # define a function to count the transition (s,a)->next_state in the model
+    def _record(self,state,action,reward,next_state):
+        next_states=self.model_next_state[state,action]
+        slots=np.flatnonzero(next_states==next_state)
+        if len(slots)==0:
+            slots=np.flatnonzero(next_states<0)
+            if len(slots)==0:
+                raise ValueError('more than {} next states observed for state {} and action {}'.format(len(next_states),state,action))
+            if slots[0]==0:
+                self.observed.append(state*self.n_actions+action)
+            next_states[slots[0]]=next_state
+            self.model_reward[state,action,slots[0]]=reward
+            self.predecessors.setdefault(next_state,set()).add(state*self.n_actions+action)
+        self.model_counts[state,action,slots[0]]+=1
+        counts=self.model_counts[state,action]
+        n=int((counts>0).sum())
+        self.transitions[state*self.n_actions+action]=(self.model_next_state[state,action,:n].tolist(),
+                                                      (counts[:n]/counts[:n].sum()).tolist(),
+                                                      self.model_reward[state,action,:n].tolist())
+
+    # define a function to compute the expected Q-learning target of (s,a) under the model
+    def _expectedTarget(self,state,action):
+        next_states,probabilities,rewards=self.transitions[state*self.n_actions+action]
+        V=self.V
+        gamma=self.gamma
+        target=0.0
+        for next_state,probability,reward in zip(next_states,probabilities,rewards):
+            target+=probability*(reward+gamma*V[next_state])
+        return target
+
+    # define a function to move Q[s,a] towards target and refresh the greedy value of s
+    def _backup(self,state,action,target):
+        Q=self.Q
+        Q[state,action]+=self.alpha*(target-Q[state,action])
+        self.V[state]=float(Q[state].max())
+
+    # define a function to queue (s,a) if its expected update is larger than theta and than its queued priority
+    def _push(self,flat_index):
+        state,action=divmod(flat_index,self.n_actions)
+        priority=abs(self._expectedTarget(state,action)-self.Q[state,action])
+        if priority>self.theta and priority>self.priorities.get(flat_index,0.0):
+            self.priorities[flat_index]=priority
+            heapq.heappush(self.queue,(-priority,flat_index))
+
+    def update(self,state,action,reward,next_state,done):
+        self._record(state,action,reward,next_state)
+        if self.prioritized:
+            self._push(state*self.n_actions+action)
+            self._sweep()
+        else:
+            self._backup(state,action,reward+self.gamma*self.V[next_state])
+            self._plan()
+
+    # define a function to back up planning_steps (s,a) sampled uniformly from the observed ones
+    def _plan(self):
+        observed=self.observed
+        for _ in range(self.planning_steps):
+            state,action=divmod(observed[self.random.randrange(len(observed))],self.n_actions)
+            self._backup(state,action,self._expectedTarget(state,action))
+
+    # define a function to back up up to planning_steps (s,a) of highest priority, queueing their predecessors
+    def _sweep(self):
+        for _ in range(self.planning_steps):
+            # skip heap entries whose priority was raised since they were pushed
+            while self.queue and self.priorities.get(self.queue[0][1])!=-self.queue[0][0]:
+                heapq.heappop(self.queue)
+            if not self.queue:
+                break
+            _,flat_index=heapq.heappop(self.queue)
+            del self.priorities[flat_index]
+            state,action=divmod(flat_index,self.n_actions)
+            self._backup(state,action,self._expectedTarget(state,action))
+            for predecessor in self.predecessors.get(state,()):
+                self._push(predecessor)
+
+# define a class for a first-visit monte carlo control agent with an epsilon-soft policy
+# the returns of an episode are only used at the end of the episode, with the sample mean unless alpha is given
+# dtype is the float type of Q and the policy
+class MonteCarloAgent(Agent):
+    def __init__(self,n_states,n_actions,config=None,epsilon=0.01,alpha=None,Q=None,terminal_states=(),rng=None,policy=None,dtype=np.float64):
+        if config is None:
+            # discount factor of monteCarloControl
+            config=TrainingConfig(gamma=0.8)
+        if not callable(epsilon):
+            epsilon=ConstantSchedule(epsilon)
+        if alpha is not None and not callable(alpha):
+            alpha=ConstantSchedule(alpha)
+        # alpha None averages the returns, the schedule is not used
+        self.sample_mean=alpha is None
+        self.dtype=dtype
+        Agent.__init__(self,n_states,n_actions,config,epsilon,alpha if alpha is not None else ConstantSchedule(None),Q,terminal_states,rng)
+        # epsilon-soft policy and its cumulative distribution used for sampling
+        if policy is None:
+            policy=createRandomPolicyArray(n_states,n_actions,dtype)
+        self.policy=np.array(policy,dtype=dtype)
+        self.cdf=policyCDF(self.policy)
+        # number of first visits of (s,a)
+        self.N=np.zeros((n_states,n_actions),dtype=np.int64)
+        self.episode_buffer=EpisodeBuffer()
+        # flags of the (s,a) pairs, indexed by s*n_actions+a, already visited in the episode, cleared after every episode
+        self._seen=bytearray(n_states*n_actions)
+
+    def initialQ(self,terminal_states):
+        return createActionValuesArray(self.n_states,self.n_actions,self.dtype)
+
+    def getState(self):
+        return {'N':self.N,'policy':self.policy}
+
+    def setState(self,Q,state):
+        Agent.setState(self,Q,state)
+        self.N=np.array(state['N'])
+        self.policy=np.array(state['policy'],dtype=self.dtype)
+        self.cdf=policyCDF(self.policy)
+
+    def beginEpisode(self,episode):
+        Agent.beginEpisode(self,episode)
+        self.episode_buffer.clear()
+
+    # define a function to sample an action from the epsilon-soft policy
+    def act(self,state):
+        return sampleAction(self.cdf[state],self.random.random())
+
+    def update(self,state,action,reward,next_state,done):
+        self.episode_buffer.append(state,action,reward)
+
+    # define a function to update Q and the policy from the first visits of the episode, latest first
+    def endEpisode(self):
+        episode=self.episode_buffer
+        T=len(episode)
+        if T==0:
+            return
+        states=episode.states[:T]
+        actions=episode.actions[:T]
+        rewards=episode.rewards[:T]
+        Q,N,policy=self.Q,self.N,self.policy
+        n_actions=self.n_actions
+        # cumulative discounted rewards as monteCarloControl
+        G=self.gamma*np.cumsum(rewards[::-1])[::-1]
+        # collect the time of the first visit of every (s,a) in one forward pass, in O(T)
+        seen=self._seen
+        first_visit=[]
+        keys=(states*n_actions+actions).tolist()
+        for i,key in enumerate(keys):
+            if not seen[key]:
+                seen[key]=1
+                first_visit.append(i)
+        for i in first_visit:
+            seen[keys[i]]=0
+        for i in reversed(first_visit):
+            s=int(states[i])
+            a=int(actions[i])
+            N[s,a]+=1
+            if self.sample_mean:
+                Q[s,a]+=(G[i]-Q[s,a])/N[s,a]
+            else:
+                Q[s,a]+=self.alpha*(G[i]-Q[s,a])
+            # epsilon-greedy with respect to Q, ties broken at random
+            greedy_actions=np.flatnonzero(Q[s]==Q[s].max())
+            A_star=self.random.choice(greedy_actions)
+            policy[s,:]=self.epsilon/n_actions
+            policy[s,A_star]=1-self.epsilon+self.epsilon/n_actions
+            self.cdf[s]=policyCDF(policy[s])
+
+    def greedyPolicy(self):
+        return np.argmax(self.policy,axis=1)
+
+# agents by name, the names of the trainer scripts
+AGENTS={'mc':MonteCarloAgent,'sarsa':SarsaAgent,'Q_learning':QLearningAgent,
+        'expected_sarsa':ExpectedSarsaAgent,'double_Q_learning':DoubleQLearningAgent,
+        'sarsa_lambda':SarsaLambdaAgent,'Q_lambda':QLambdaAgent,'dyna_Q':DynaQAgent}
+
+# define a function to create an agent for an environment, config defaults to the one of the trainer script
+# extended picks the hyperparameters of the 10x10 trainers
+# the agent draws from the random stream of env, which is reseeded with rng if given, one generator for the whole run
+def makeAgent(name,env,config=None,extended=False,rng=None,**kwargs):
+    if name not in AGENTS:
+        raise ValueError('unknown agent: {}, expected one of {}'.format(name,sorted(AGENTS)))
+    model=mapOf(env)
+    config_name=name+'_extended' if extended else name
+    if config is None:
+        config=DEFAULT_CONFIGS.get(config_name)
+    return AGENTS[name](model.n_states,model.n_actions,config,terminal_states=np.flatnonzero(model.state_terminal),rng=randomStream(env,rng),**kwargs)
@@ -0,0 +1,155 @@
+import numpy as np
+from time import time
+from frozenlake_env import BatchFrozenLake, MAPS
+from action_selection import batchEpsilonGreedy
+from training_config import DEFAULT_CONFIGS
+from metrics import Metrics
+
+
+# define a function to initialize the Q table the same way as the single episode trainers, from the generator of env
+def initialQ(env):
+    Q=env.np_random.uniform(low=0.0,high=1e-3,size=(env.n_states,env.n_actions))
+    # assign 0 action values to terminal states
+    Q[env.model.state_terminal,:]=0.0
+    return Q
+
+# define a function to apply the updates of all lanes at once, lanes updating the same (s,a) are averaged
+def _batchUpdate(Q,states,actions,targets,alpha):
+    n_actions=Q.shape[1]
+    # flat index of every state-action pair
+    sa=states*n_actions+actions
+    unique_sa,inverse=np.unique(sa,return_inverse=True)
+    # mean target of every distinct state-action pair
+    mean_targets=np.bincount(inverse,weights=targets)/np.bincount(inverse)
+    Q_flat=Q.reshape(-1)
+    Q_flat[unique_sa]+=alpha*(mean_targets-Q_flat[unique_sa])
+
+# define a class to collect the rewards and timesteps of the episodes finished by the lanes and report them to metrics,
+# and to keep the epsilon of every lane, the one of config for the number of episodes the lane has finished
+class _EpisodeStats:
+    def __init__(self,n_envs,config,metrics):
+        self.config=config
+        self.metrics=metrics
+        self.total_rewards=np.zeros(n_envs)
+        self.steps=np.zeros(n_envs,dtype=np.int64)
+        self.episodes=np.zeros(n_envs,dtype=np.int64)
+        self._epsilon_table=np.array([config.epsilonAt(0)])
+        self.epsilon=np.full(n_envs,config.epsilonAt(0))
+        self.rewards=[]
+        self.timesteps=[]
+
+    def update(self,rewards,dones):
+        self.total_rewards+=rewards
+        self.steps+=1
+        if dones.any():
+            self.rewards.append(self.total_rewards[dones])
+            self.timesteps.append(self.steps[dones])
+            # report the finished episodes of the step at once
+            successes=self.rewards[-1]==1.0
+            self.metrics.increment('frisbees',int(np.count_nonzero(successes)))
+            self.metrics.recordMany('reward',self.rewards[-1])
+            self.metrics.recordMany('success',successes)
+            self.metrics.recordMany('timesteps',self.timesteps[-1])
+            self.metrics.endEpisode(n=len(successes))
+            self.total_rewards[dones]=0.0
+            self.steps[dones]=0
+            self.episodes[dones]+=1
+            episodes=self.episodes[dones]
+            # epsilon of config by number of finished episodes, extended when a lane goes past its end
+            if episodes.max()>=len(self._epsilon_table):
+                self._epsilon_table=np.array([self.config.epsilonAt(episode) for episode in range(0,2*int(episodes.max())+1)])
+            self.epsilon[dones]=self._epsilon_table[episodes]
+
+    def result(self):
+        if not self.rewards:
+            return np.zeros(0),np.zeros(0,dtype=np.int64)
+        return np.concatenate(self.rewards),np.concatenate(self.timesteps)
+
+    # define a function to send the final summary of a run to metrics as the driver of training.py
+    def summary(self,name,n_transitions,t):
+        rewards,timesteps=self.result()
+        self.metrics.summary({'agent':name,
+                              'time':t,
+                              'transitions':n_transitions,
+                              'steps per second':n_transitions/t if t>0 else 0.0,
+                              'frisbees':'{} frisbees obtained in {} episodes'.format(int(np.sum(rewards==1.0)),len(rewards)),
+                              'average timesteps taken':np.mean(timesteps) if len(timesteps) else 0.0,
+                              'score over time':np.mean(rewards) if len(rewards) else 0.0})
+
+# define a function to run Q-learning on all lanes of a BatchFrozenLake for n_steps lockstep steps
+# the learning rate is kept at config.alpha, the finished episodes are reported to metrics
+def batch_Q_learning(env,n_steps=10000,config=None,Q=None,metrics=None):
+    t1=time()
+    # hyperparameters of the trainer, default to the values used in the project
+    if config is None:
+        config=DEFAULT_CONFIGS['Q_learning']
+    if metrics is None:
+        metrics=Metrics()
+    gamma,alpha=config.gamma,config.alpha
+    rng=env.np_random
+    # reward of entering each state
+    state_rewards=env.model.state_reward
+    if Q is None:
+        Q=initialQ(env)
+    stats=_EpisodeStats(env.n_envs,config,metrics)
+    for step in range(0,n_steps):
+        states=env.states
+        # epsilon of every lane decays with the number of episodes it has finished
+        actions=batchEpsilonGreedy(Q,states,stats.epsilon,rng)
+        next_states,_,dones,_=env.step(actions)
+        rewards=state_rewards[next_states]
+        # update estimated action values Q[S,A] of all lanes
+        targets=rewards+gamma*np.max(Q[next_states,:],axis=1)
+        _batchUpdate(Q,states,actions,targets,alpha)
+        stats.update(rewards,dones)
+    t2=time()
+    stats.summary('batch_Q_learning',n_steps*env.n_envs,t2-t1)
+    rewards,timesteps=stats.result()
+    return Q,rewards,timesteps
+
+# define a function to run sarsa on all lanes of a BatchFrozenLake for n_steps lockstep steps
+# the learning rate is kept at config.alpha, the finished episodes are reported to metrics
+def batch_sarsa(env,n_steps=10000,config=None,Q=None,metrics=None):
+    t1=time()
+    # hyperparameters of the trainer, default to the values used in the project
+    if config is None:
+        config=DEFAULT_CONFIGS['sarsa']
+    if metrics is None:
+        metrics=Metrics()
+    gamma,alpha=config.gamma,config.alpha
+    rng=env.np_random
+    # reward of entering each state
+    state_rewards=env.model.state_reward
+    if Q is None:
+        Q=initialQ(env)
+    stats=_EpisodeStats(env.n_envs,config,metrics)
+    # choose A from S for every lane using epsilon-greedy policy
+    actions=batchEpsilonGreedy(Q,env.states,stats.epsilon,rng)
+    for step in range(0,n_steps):
+        states=env.states
+        next_states,_,dones,_=env.step(actions)
+        rewards=state_rewards[next_states]
+        # choose A' from S' using epsilon-greedy policy
+        next_actions=batchEpsilonGreedy(Q,next_states,stats.epsilon,rng)
+        # update estimated action values Q[S,A] of all lanes
+        targets=rewards+gamma*Q[next_states,next_actions]
+        _batchUpdate(Q,states,actions,targets,alpha)
+        stats.update(rewards,dones)
+        # lanes that were reset choose their first action from the new start state, with the epsilon of their next episode
+        if dones.any():
+            next_actions[dones]=batchEpsilonGreedy(Q,env.states[dones],stats.epsilon[dones],rng)
+        actions=next_actions
+    t2=time()
+    stats.summary('batch_sarsa',n_steps*env.n_envs,t2-t1)
+    rewards,timesteps=stats.result()
+    return Q,rewards,timesteps
+
+def main(metrics=None):
+    print('batch_training.py')
+    # extended grid of 10x10 of the *_extended.py scripts
+    env=BatchFrozenLake(MAPS['10x10'],n_envs=4096,seed=0)
+    config=DEFAULT_CONFIGS['Q_learning'].replace(gamma=0.8,min_epsilon=0.001)
+    Q,rewards,timesteps=batch_Q_learning(env,n_steps=2000,config=config,metrics=metrics)
+
+if __name__=='__main__':
+    main()
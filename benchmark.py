@@ -0,0 +1,112 @@
+import os
+import csv
+import argparse
+import resource
+import contextlib
+import numpy as np
+from time import time
+from concurrent.futures import ProcessPoolExecutor
+from frozenlake_env import ArrayFrozenLake, compileMap
+from map_generator import generateMap
+from metrics import Metrics
+from dp import value_iteration
+import mc_extended
+import Q_learning_extended
+import sarsa_extended
+
+
+# algorithms timed by the benchmark
+ALGORITHMS=('monteCarloControl','Q_learning_extended','sarsa_extended','value_iteration')
+
+# define a class of metrics without sinks that keeps the reward and timesteps of every episode
+class _EpisodeRecorder(Metrics):
+    def __init__(self):
+        Metrics.__init__(self,sinks=[],flush_every=0)
+        self.rewards=[]
+        self.timesteps=[]
+
+    def record(self,name,value):
+        if name=='reward':
+            self.rewards.append(value)
+        elif name=='timesteps':
+            self.timesteps.append(value)
+
+# define a function to find the first episode at which the success rate over the last window episodes reaches target_rate
+def episodesToConvergence(rewards,target_rate,window=100):
+    if len(rewards)<window:
+        return None
+    successes=np.asarray(rewards)==1.0
+    rates=np.convolve(successes,np.ones(window)/window,mode='valid')
+    reached=np.flatnonzero(rates>=target_rate)
+    return int(reached[0])+window if len(reached) else None
+
+# define a function to run one algorithm on one map, executed in a fresh worker process so its peak memory is its own
+def runCase(algorithm,desc,n_episodes,max_steps,seed,target_rate,window):
+    t1=time()
+    model=compileMap(desc)
+    compile_seconds=time()-t1
+    result={'algorithm':algorithm,'states':model.n_states,'compile_seconds':compile_seconds}
+    with open(os.devnull,'w') as devnull, contextlib.redirect_stdout(devnull):
+        if algorithm=='value_iteration':
+            t1=time()
+            V,Q,actions,n_iterations=value_iteration(model,gamma=0.8)
+            seconds=time()-t1
+            # state-action backups instead of environment steps
+            steps=n_iterations*model.n_states*model.n_actions
+            result.update({'episodes':None,'episodes_to_convergence':n_iterations})
+        else:
+            # the trainers draw from the seeded generator of the environment
+            env=ArrayFrozenLake(model,max_episode_steps=max_steps,seed=seed)
+            recorder=_EpisodeRecorder()
+            t1=time()
+            if algorithm=='monteCarloControl':
+                mc_extended.monteCarloControl(env,n_episodes,metrics=recorder)
+            elif algorithm=='Q_learning_extended':
+                Q_learning_extended.Q_learning_extended(env,n_episodes,max_steps,metrics=recorder,render=False)
+            elif algorithm=='sarsa_extended':
+                sarsa_extended.sarsa_extended(env,n_episodes,max_steps,metrics=recorder,render=False)
+            seconds=time()-t1
+            steps=int(np.sum(recorder.timesteps))
+            result.update({'episodes':n_episodes,'episodes_to_convergence':episodesToConvergence(recorder.rewards,target_rate,window)})
+    # peak resident memory of the worker process, ru_maxrss is in kilobytes on linux
+    result.update({'seconds':seconds,'steps':steps,'steps_per_sec':steps/seconds if seconds>0 else None,
+                   'peak_memory_mb':resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024})
+    return result
+
+# define a function to time every algorithm on generated maps of every size
+# episodes are truncated after max_steps, 4*(n_row+n_col) steps by default so the goal stays reachable on large maps
+def runBenchmark(sizes=(10,32,100,316,1000),algorithms=ALGORITHMS,n_episodes=200,hole_density=0.2,max_steps=None,seed=0,target_rate=0.05,window=100):
+    results=[]
+    for size in sizes:
+        desc=generateMap(size,hole_density,seed)
+        steps=max_steps if max_steps is not None else 4*(2*size)
+        for algorithm in algorithms:
+            # a new process for every case
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result=executor.submit(runCase,algorithm,desc,n_episodes,steps,seed,target_rate,window).result()
+            result['size']=size
+            # a case too fast for the clock has no steps per second
+            speed='{:.0f}/s'.format(result['steps_per_sec']) if result['steps_per_sec'] is not None else 'n/a'
+            print('{size}x{size} {algorithm}: {steps} steps in {seconds:.3f}s ({speed}), peak memory {peak_memory_mb:.1f}MB, converged after {episodes_to_convergence}'.format(speed=speed,**result))
+            results.append(result)
+    return results
+
+def main():
+    parser=argparse.ArgumentParser()
+    parser.add_argument('--sizes',type=int,nargs='+',default=[10,32,100,316,1000])
+    parser.add_argument('--algorithms',nargs='+',default=list(ALGORITHMS),choices=ALGORITHMS)
+    parser.add_argument('--episodes',type=int,default=200)
+    parser.add_argument('--hole-density',type=float,default=0.2)
+    parser.add_argument('--seed',type=int,default=0)
+    parser.add_argument('--csv',default=None)
+    args=parser.parse_args()
+    print('benchmark.py')
+    results=runBenchmark(args.sizes,args.algorithms,args.episodes,args.hole_density,seed=args.seed)
+    if args.csv:
+        with open(args.csv,'w',newline='') as f:
+            writer=csv.DictWriter(f,fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+
+if __name__=='__main__':
+    main()
@@ -0,0 +1,107 @@
+import os
+import json
+import numpy as np
+from frozenlake_env import ArrayFrozenLake
+from rng import getRngState, setRngState
+from training_config import TrainingConfig
+
+
+# version of the checkpoint layout, stored in every file
+CHECKPOINT_VERSION=2
+
+# define a function to save the random number generators of the environment and the trainer
+# the gym environment samples from env.unwrapped.np_random, a Generator or a RandomState depending on the gym version,
+# the array simulator from env.np_random through its random stream of pre-generated numbers
+# random_stream is the stream the trainer draws its actions from, when it is not the stream of the environment
+def getRandomState(env=None,random_stream=None):
+    arrays={}
+    info={}
+    if isinstance(env,ArrayFrozenLake):
+        _getStreamState(env.random_stream,'env',arrays,info)
+    elif env is not None:
+        info['env']=getRngState(getattr(env,'unwrapped',env).np_random)
+    if random_stream is not None and random_stream is not getattr(env,'random_stream',None):
+        _getStreamState(random_stream,'stream',arrays,info)
+    return arrays,info
+
+# define functions to save and restore a random stream under name, the block of pre-generated numbers is stored as an array
+def _getStreamState(random_stream,name,arrays,info):
+    state=random_stream.getState()
+    info[name]=state['rng']
+    info[name+'_block_pos']=state['block_pos']
+    arrays[name+'_block']=np.array(state['block'],dtype=np.float64)
+
+def _setStreamState(random_stream,name,arrays,info):
+    random_stream.setState({'rng':info[name],'block':arrays[name+'_block'].tolist(),'block_pos':info[name+'_block_pos']})
+
+# define a function to restore the random number generators saved by getRandomState
+def setRandomState(arrays,info,env=None,random_stream=None):
+    if isinstance(env,ArrayFrozenLake):
+        _setStreamState(env.random_stream,'env',arrays,info)
+    elif env is not None:
+        setRngState(getattr(env,'unwrapped',env).np_random,info['env'])
+    if random_stream is not None and 'stream' in info:
+        _setStreamState(random_stream,'stream',arrays,info)
+
+# define a function to save the state of a training run to a .npz file, written to a temporary file first
+# so an interruption while saving leaves the previous checkpoint intact
+# episode is the next episode to run and end_episode the episode the run stops before
+# a run writing its episodes to an on-disk history only stores the length of the history
+# agent_state is a dict of arrays of the agent besides Q, as returned by agent.getState()
+def saveCheckpoint(path,Q,episode,end_episode,rewards,timesteps,n_frisbees,config,env=None,metrics=None,history=None,random_stream=None,agent_state=None):
+    arrays,info=getRandomState(env,random_stream)
+    for name,value in (agent_state or {}).items():
+        arrays['agent_'+name]=value
+    info.update({'version':CHECKPOINT_VERSION,
+                 'episode':episode,
+                 'end_episode':end_episode,
+                 'n_frisbees':n_frisbees,
+                 'config':config.asdict(),
+                 'metrics':metrics.getState() if metrics is not None else None,
+                 'history_length':len(history) if history is not None else None})
+    if history is not None:
+        history.flush()
+        rewards,timesteps=[],[]
+    tmp_path=path+'.tmp'
+    with open(tmp_path,'wb') as f:
+        np.savez(f,Q=Q,rewards=np.asarray(rewards,dtype=np.float64),timesteps=np.asarray(timesteps,dtype=np.int64),
+                 info=np.array(json.dumps(info)),**arrays)
+    os.replace(tmp_path,path)
+
+# define a class to hold a loaded checkpoint
+class Checkpoint:
+    def __init__(self,path):
+        with np.load(path) as data:
+            self.arrays={name:data[name] for name in data.files}
+        self.info=json.loads(str(self.arrays.pop('info')))
+        if self.info['version']!=CHECKPOINT_VERSION:
+            raise ValueError('unsupported checkpoint version: {}'.format(self.info['version']))
+        self.Q=self.arrays.pop('Q')
+        self.rewards=self.arrays.pop('rewards').tolist()
+        self.timesteps=self.arrays.pop('timesteps').tolist()
+        self.episode=self.info['episode']
+        self.end_episode=self.info['end_episode']
+        self.n_frisbees=self.info['n_frisbees']
+        self.history_length=self.info['history_length']
+        self.config=TrainingConfig(**self.info['config'])
+        # arrays of the agent besides Q
+        self.agent_state={name[len('agent_'):]:self.arrays.pop(name) for name in list(self.arrays) if name.startswith('agent_')}
+
+    # define a function to restore the random number generators and the metrics of the run
+    # and drop the episodes written to the history after the checkpoint
+    def restore(self,env=None,metrics=None,history=None,random_stream=None):
+        setRandomState(self.arrays,self.info,env,random_stream)
+        if metrics is not None and self.info['metrics'] is not None:
+            metrics.setState(self.info['metrics'])
+        if history is not None and self.history_length is not None:
+            history.truncate(self.history_length)
+
+# define a function to load a checkpoint saved by saveCheckpoint
+def loadCheckpoint(path):
+    return Checkpoint(path)
+
+# define a function to read only the training config of a checkpoint, without loading its arrays
+def loadCheckpointConfig(path):
+    with np.load(path) as data:
+        info=json.loads(str(data['info']))
+    return TrainingConfig(**info['config'])
@@ -0,0 +1,110 @@
+import numpy as np
+from time import time
+from frozenlake_env import compileMap, CompiledMap, MAPS
+try:
+    import scipy.sparse
+except ImportError:
+    scipy=None
+
+
+# define a function to compile a map unless it is already compiled
+def asCompiledMap(desc,is_slippery=True):
+    if isinstance(desc,CompiledMap):
+        return desc
+    return compileMap(desc,is_slippery=is_slippery)
+
+# define a function to compute action values from state values with the repo's reward scheme (+1 goal, -1 hole)
+# Q[s,a]=sum_k p(k|s,a)*(r(s'_k)+gamma*V[s'_k]), action values of holes and goal are 0
+def qFromV(model,V,gamma):
+    Q=np.sum(model.prob*(model.state_reward[model.next_state]+gamma*V[model.next_state]),axis=2)
+    Q[model.state_terminal,:]=0.0
+    return Q
+
+# define a function to build the state transition matrix P_pi[s,s'] and expected reward r_pi[s] of a policy
+# policy is an array of action probabilities of shape (states, actions), P_pi is a scipy.sparse matrix if sparse is True
+def policyTransitions(model,policy,sparse=False):
+    n_states=model.n_states
+    # probability of every outcome under the policy
+    weights=policy[:,:,None]*model.prob
+    # no transitions out of holes and goal
+    weights[model.state_terminal]=0.0
+    rows=np.broadcast_to(np.arange(n_states)[:,None,None],model.next_state.shape).ravel()
+    if sparse:
+        # duplicate (s,s') entries are summed when converting to csr
+        P_pi=scipy.sparse.coo_matrix((weights.ravel(),(rows,model.next_state.ravel())),shape=(n_states,n_states)).tocsr()
+    else:
+        P_pi=np.zeros((n_states,n_states))
+        np.add.at(P_pi,(rows,model.next_state.ravel()),weights.ravel())
+    r_pi=np.sum(weights*model.state_reward[model.next_state],axis=(1,2))
+    return P_pi,r_pi
+
+# define a function to find optimal state values V*, action values Q* and greedy policy using value iteration
+def value_iteration(desc=None,gamma=0.8,theta=1e-10,max_iterations=100000,is_slippery=True):
+    if desc is None:
+        desc=MAPS['4x4']
+    model=asCompiledMap(desc,is_slippery)
+    V=np.zeros(model.n_states)
+    for iteration in range(1,max_iterations+1):
+        # bellman optimality backup of all states at once
+        Q=qFromV(model,V,gamma)
+        V_new=np.max(Q,axis=1)
+        delta=np.max(np.abs(V_new-V))
+        V=V_new
+        if delta<theta:
+            break
+    Q=qFromV(model,V,gamma)
+    return V,Q,np.argmax(Q,axis=1),iteration
+
+# define a function to find optimal state values V*, action values Q* and greedy policy using policy iteration
+def policy_iteration(desc=None,gamma=0.8,max_iterations=1000,is_slippery=True):
+    if desc is None:
+        desc=MAPS['4x4']
+    model=asCompiledMap(desc,is_slippery)
+    n_states,n_actions=model.n_states,model.n_actions
+    # start from the policy always going left
+    actions=np.zeros(n_states,dtype=np.int64)
+    for iteration in range(1,max_iterations+1):
+        # policy evaluation, solve (I-gamma*P_pi)V=r_pi exactly
+        policy=np.zeros((n_states,n_actions))
+        policy[np.arange(n_states),actions]=1.0
+        P_pi,r_pi=policyTransitions(model,policy)
+        V=np.linalg.solve(np.eye(n_states)-gamma*P_pi,r_pi)
+        # policy improvement, keep the current action unless another one is strictly better
+        Q=qFromV(model,V,gamma)
+        new_actions=np.argmax(Q,axis=1)
+        keep=Q[np.arange(n_states),actions]>=Q[np.arange(n_states),new_actions]-1e-12
+        new_actions[keep]=actions[keep]
+        if np.array_equal(new_actions,actions):
+            break
+        actions=new_actions
+    return V,Q,actions,iteration
+
+# define a class to record the distance between a trainer's Q and Q* after every episode, pass it as on_episode to a trainer
+class QStarDistance:
+    def __init__(self,Q_star):
+        self.Q_star=np.asarray(Q_star)
+        # max and mean |Q-Q*| after every episode
+        self.distances=[]
+        self.mean_distances=[]
+
+    def __call__(self,episode,Q):
+        error=np.abs(Q-self.Q_star)
+        self.distances.append(float(np.max(error)))
+        self.mean_distances.append(float(np.mean(error)))
+
+def main():
+    print('dp.py')
+    for name,gamma in (('4x4',0.9),('10x10',0.8)):
+        t1=time()
+        V,Q,actions,n_iterations=value_iteration(MAPS[name],gamma)
+        t2=time()
+        print('{} map, gamma {}: value iteration converged in {} iterations, {:.2f}ms'.format(name,gamma,n_iterations,1000*(t2-t1)))
+        t1=time()
+        V_pi,Q_pi,actions_pi,n_iterations=policy_iteration(MAPS[name],gamma)
+        t2=time()
+        print('{} map, gamma {}: policy iteration converged in {} iterations, {:.2f}ms'.format(name,gamma,n_iterations,1000*(t2-t1)))
+        print('max |V_vi-V_pi|: {}'.format(np.max(np.abs(V-V_pi))))
+        print('V*=',V.reshape(len(MAPS[name]),-1).round(3),'\n')
+
+if __name__=='__main__':
+    main()
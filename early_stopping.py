@@ -0,0 +1,108 @@
+import numpy as np
+from metrics import RollingMean
+
+
+# stopping criteria are called by the trainers after every episode as criterion(episode,Q,total_rewards)
+# and return True once training can stop, the episode is kept in criterion.episode
+# the expensive checks only run every check_every episodes so the per-episode cost is O(1) amortized
+
+# define a base class for the stopping criteria, no criterion stops before min_episodes episodes
+class StoppingCriterion:
+    def __init__(self,min_episodes=0):
+        self.min_episodes=min_episodes
+        self.episode=None
+        self.n_episodes=0
+
+    def __call__(self,episode,Q,total_rewards):
+        self.n_episodes+=1
+        if self.update(episode,Q,total_rewards) and self.n_episodes>=self.min_episodes:
+            self.episode=episode
+            return True
+        return False
+
+    def update(self,episode,Q,total_rewards):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return '{}(episode={})'.format(type(self).__name__,self.episode)
+
+# define a class to stop when no action value changed by more than tolerance over the last window episodes
+class QChange(StoppingCriterion):
+    def __init__(self,tolerance=1e-4,window=1000,min_episodes=0):
+        StoppingCriterion.__init__(self,min_episodes)
+        self.tolerance=tolerance
+        self.window=window
+        self.previous_Q=None
+        # max |delta Q| of the last finished window
+        self.max_change=None
+
+    def update(self,episode,Q,total_rewards):
+        if self.n_episodes%self.window:
+            return False
+        if self.previous_Q is None:
+            self.previous_Q=np.array(Q)
+            return False
+        self.max_change=float(np.max(np.abs(Q-self.previous_Q)))
+        self.previous_Q[...]=Q
+        return self.max_change<=self.tolerance
+
+# define a class to stop when the greedy action of every state stayed the same for patience episodes
+class PolicyStable(StoppingCriterion):
+    def __init__(self,patience=1000,check_every=100,min_episodes=0):
+        StoppingCriterion.__init__(self,min_episodes)
+        self.patience=patience
+        self.check_every=check_every
+        self.greedy_actions=None
+        # number of episodes the greedy policy has not changed for
+        self.unchanged=0
+
+    def update(self,episode,Q,total_rewards):
+        if self.n_episodes%self.check_every:
+            return False
+        greedy_actions=np.argmax(Q,axis=1)
+        if self.greedy_actions is not None and np.array_equal(greedy_actions,self.greedy_actions):
+            self.unchanged+=self.check_every
+        else:
+            self.unchanged=0
+        self.greedy_actions=greedy_actions
+        return self.unchanged>=self.patience
+
+# define a class to stop when the rolling success rate of the last window episodes changed by less than tolerance
+# for patience consecutive windows
+class SuccessPlateau(StoppingCriterion):
+    def __init__(self,window=1000,tolerance=0.01,patience=3,min_episodes=0):
+        StoppingCriterion.__init__(self,min_episodes)
+        self.window=window
+        self.tolerance=tolerance
+        self.patience=patience
+        self.success_rate=RollingMean(window)
+        self.previous_rate=None
+        # number of consecutive windows on the plateau
+        self.flat_windows=0
+
+    def update(self,episode,Q,total_rewards):
+        self.success_rate.add(1.0 if total_rewards==1.0 else 0.0)
+        if self.n_episodes%self.window:
+            return False
+        rate=self.success_rate.mean
+        if self.previous_rate is not None and abs(rate-self.previous_rate)<self.tolerance:
+            self.flat_windows+=1
+        else:
+            self.flat_windows=0
+        self.previous_rate=rate
+        return self.flat_windows>=self.patience
+
+# define a class to stop as soon as one of several criteria is met, the criterion met is kept in self.met
+class AnyOf(StoppingCriterion):
+    def __init__(self,*criteria,min_episodes=0):
+        StoppingCriterion.__init__(self,min_episodes)
+        self.criteria=criteria
+        self.met=None
+
+    def update(self,episode,Q,total_rewards):
+        # every criterion sees every episode, even after another one is met
+        met=[criterion for criterion in self.criteria if criterion(episode,Q,total_rewards)]
+        if met:
+            self.met=met[0]
+            return True
+        return False
@@ -0,0 +1,43 @@
+import numpy as np
+
+
+# define a class to store the sequence of (state,action,reward) of an episode in preallocated parallel arrays
+class EpisodeBuffer:
+    def __init__(self,capacity=128):
+        self.states=np.zeros(capacity,dtype=np.int64)
+        self.actions=np.zeros(capacity,dtype=np.int64)
+        self.rewards=np.zeros(capacity,dtype=np.float64)
+        # number of steps stored in the buffer
+        self.length=0
+
+    # define a function to empty the buffer, the arrays are kept for the next episode
+    def clear(self):
+        self.length=0
+
+    # define a function to double the capacity of the buffer when it is full
+    def _grow(self):
+        capacity=2*len(self.states)
+        for name in ('states','actions','rewards'):
+            old=getattr(self,name)
+            new=np.zeros(capacity,dtype=old.dtype)
+            new[:self.length]=old[:self.length]
+            setattr(self,name,new)
+
+    def append(self,state,action,reward):
+        if self.length==len(self.states):
+            self._grow()
+        self.states[self.length]=state
+        self.actions[self.length]=action
+        self.rewards[self.length]=reward
+        self.length+=1
+
+    def __len__(self):
+        return self.length
+
+    # episode[i] returns the triplet (state,action,reward) at time i, as with the list of tuples
+    def __getitem__(self,i):
+        if i<0:
+            i+=self.length
+        if not 0<=i<self.length:
+            raise IndexError('episode index out of range')
+        return int(self.states[i]),int(self.actions[i]),float(self.rewards[i])
@@ -0,0 +1,311 @@
+import numpy as np
+from rng import RANDOM_BLOCK_SIZE, RandomStream, makeRng, intSeed
+
+
+# default maps of the FrozenLake environment, '4x4' is the gym default and '10x10' is the extended grid used in the *_extended.py scripts
+MAPS={'4x4':['SFFF',
+             'FHFH',
+             'FFFH',
+             'HFFG'],
+      '10x10':['SFFFFHFFFF',
+               'FFHFFFHFFF',
+               'FHFFHFFFFF',
+               'FFFFHFFHFF',
+               'HFFFFHFFFH',
+               'FFHHFFHHFF',
+               'FHFFFFHFHF',
+               'FFHFFHFHFF',
+               'HFFFFHFFHF',
+               'HFFHFFFFFG']}
+
+# actions of the FrozenLake environment
+LEFT=0
+DOWN=1
+RIGHT=2
+UP=3
+
+# number of steps after which gym.make('FrozenLake-v1') truncates an episode
+MAX_EPISODE_STEPS=100
+
+# largest number of transition entries the simulator converts to python lists
+MAX_LIST_SIZE=1<<20
+
+
+# define a class to hold the dense transition arrays of a FrozenLake map
+class CompiledMap:
+    def __init__(self,desc,next_state,prob,reward,terminal,start_distribution):
+        # map description as a 2d array of single byte characters
+        self.desc=desc
+        # size of the gridworld
+        self.n_row,self.n_col=desc.shape
+        # number of states, actions and possible outcomes of a single action
+        self.n_states,self.n_actions,self.n_outcomes=next_state.shape
+        # next_state[s,a,k] is the k-th possible next state after taking action a in state s
+        self.next_state=next_state
+        # prob[s,a,k] is the probability of that outcome
+        self.prob=prob
+        # reward[s,a,k] is the gym reward of that outcome (1.0 when the goal is reached)
+        self.reward=reward
+        # terminal[s,a,k] is True when the outcome ends the episode
+        self.terminal=terminal
+        # cumulative probabilities used to sample an outcome with a single uniform draw
+        self.cdf=np.cumsum(prob,axis=2)
+        # make sure the last outcome is always selected for u<1.0 despite rounding errors
+        self.cdf[:,:,-1]=1.0
+        # reward of entering each state as used by the trainers (+1 goal, -1 hole, 0 otherwise)
+        self.state_reward=stateRewards(desc)
+        # True for the states that end an episode, holes and goal
+        flat_desc=desc.ravel()
+        self.state_terminal=(flat_desc==b'H')|(flat_desc==b'G')
+        # tuples of the hole and goal states, derived from the map instead of hard-coded
+        self.holes=tuple(np.flatnonzero(flat_desc==b'H').tolist())
+        self.goal=tuple(np.flatnonzero(flat_desc==b'G').tolist())
+        # probability of starting an episode in each state
+        self.start_distribution=start_distribution
+        # start states and their cumulative probabilities
+        self.start_states=np.flatnonzero(start_distribution)
+        self.start_cdf=np.cumsum(start_distribution[self.start_states])
+        self.start_cdf[-1]=1.0
+
+# define a function to build the reward of entering each state as used by the trainers (+1 goal, -1 hole, 0 otherwise)
+def stateRewards(desc):
+    desc=np.asarray(desc,dtype='c').ravel()
+    return np.where(desc==b'G',1.0,np.where(desc==b'H',-1.0,0.0))
+
+# row and column offsets of the actions LEFT, DOWN, RIGHT, UP
+_ROW_STEP=np.array([0,1,0,-1])
+_COL_STEP=np.array([-1,0,1,0])
+
+# define a function to compile a FrozenLake map into dense transition arrays, all states at once
+def compileMap(desc=None,map_name='4x4',is_slippery=True):
+    # use one of the default maps if no map description is given
+    if desc is None:
+        desc=MAPS[map_name]
+    # convert the map description to a 2d array of characters, same as gym
+    desc=np.asarray(desc,dtype='c')
+    n_row,n_col=desc.shape
+    n_states=n_row*n_col
+    n_actions=4
+    flat_desc=desc.ravel()
+    # on a slippery lake the agent moves in the intended or one of the 2 perpendicular directions
+    if is_slippery:
+        offsets=np.array([-1,0,1])
+    else:
+        offsets=np.array([0])
+    n_outcomes=len(offsets)
+    # direction actually moved for every (action, outcome)
+    directions=(np.arange(n_actions)[:,None]+offsets[None,:])%4
+    # move from every state in every direction, staying in place at the borders
+    rows=np.arange(n_states)//n_col
+    cols=np.arange(n_states)%n_col
+    new_rows=np.clip(rows[:,None,None]+_ROW_STEP[directions][None,:,:],0,n_row-1)
+    new_cols=np.clip(cols[:,None,None]+_COL_STEP[directions][None,:,:],0,n_col-1)
+    next_state=new_rows*n_col+new_cols
+    new_letters=flat_desc[next_state]
+    prob=np.full((n_states,n_actions,n_outcomes),1.0/n_outcomes)
+    reward=np.array(new_letters==b'G',dtype=np.float64)
+    terminal=(new_letters==b'G')|(new_letters==b'H')
+    # holes and goal are absorbing states, the episode stays done there
+    absorbing=(flat_desc==b'G')|(flat_desc==b'H')
+    next_state[absorbing]=np.flatnonzero(absorbing)[:,None,None]
+    prob[absorbing]=0.0
+    prob[absorbing,:,0]=1.0
+    reward[absorbing]=0.0
+    terminal[absorbing]=True
+    # episodes start uniformly in one of the 'S' states
+    start_distribution=np.array(flat_desc==b'S',dtype=np.float64)
+    start_distribution/=start_distribution.sum()
+    return CompiledMap(desc,next_state,prob,reward,terminal,start_distribution)
+
+# define a function to get the compiled map of an environment, compiling the map of a gym environment once
+def mapOf(env):
+    model=getattr(env,'model',None)
+    if isinstance(model,CompiledMap):
+        return model
+    # gym wrappers keep the FrozenLakeEnv in env.unwrapped, the map is slippery when an action of a start state
+    # has several outcomes in its transition table P, not the current state which may be an absorbing hole or goal
+    unwrapped=getattr(env,'unwrapped',env)
+    desc=np.asarray(unwrapped.desc,dtype='c')
+    P=getattr(unwrapped,'P',None)
+    start_state=int(np.flatnonzero(desc.ravel()==b'S')[0])
+    is_slippery=P is None or len(P[start_state][0])>1
+    return compileMap(desc,is_slippery=is_slippery)
+
+# define a class for a discrete space with the same n and sample() as gym.spaces.Discrete
+class Discrete:
+    def __init__(self,n,env):
+        self.n=n
+        self._env=env
+
+    def sample(self):
+        return min(int(self._env._uniform()*self.n),self.n-1)
+
+    def __repr__(self):
+        return 'Discrete({})'.format(self.n)
+
+# define a FrozenLake simulator stepping from the dense arrays of a compiled map
+class ArrayFrozenLake:
+    def __init__(self,desc=None,map_name='4x4',is_slippery=True,max_episode_steps=MAX_EPISODE_STEPS,seed=None):
+        # compile the map once, accept an already compiled map as well
+        if isinstance(desc,CompiledMap):
+            self.model=desc
+        else:
+            self.model=compileMap(desc,map_name,is_slippery)
+        self.desc=self.model.desc
+        self.observation_space=Discrete(self.model.n_states,self)
+        self.action_space=Discrete(self.model.n_actions,self)
+        self.max_episode_steps=max_episode_steps
+        # python lists are faster than numpy arrays for indexing single elements in the step loop,
+        # large maps keep the numpy arrays since the lists would take several times more memory
+        if self.model.next_state.size<=MAX_LIST_SIZE:
+            self._next_state=self.model.next_state.tolist()
+            self._cdf=self.model.cdf.tolist()
+            self._reward=self.model.reward.tolist()
+            self._terminal=self.model.terminal.tolist()
+        else:
+            self._next_state=self.model.next_state
+            self._cdf=self.model.cdf
+            self._reward=self.model.reward
+            self._terminal=self.model.terminal
+        self._start_states=self.model.start_states.tolist()
+        self._start_cdf=self.model.start_cdf.tolist()
+        # current state and number of steps taken in the current episode
+        self.s=0
+        self.elapsed_steps=0
+        self.seed(seed)
+
+    # the trainers read the current state from env.env.s, as with the gym wrappers
+    @property
+    def env(self):
+        return self
+
+    # seed is an int, a SeedSequence or a Generator shared with the trainer,
+    # a new episode is started from the new generator as with reset(seed=seed) in gym
+    def seed(self,seed=None):
+        self.np_random=makeRng(seed)
+        # uniform random numbers are drawn in blocks from np_random, the trainers draw from the same stream
+        self.random_stream=RandomStream(self.np_random,RANDOM_BLOCK_SIZE)
+        # next uniform random number in [0,1)
+        self._uniform=self.random_stream.random
+        self.reset()
+        return [seed]
+
+    # define a function to sample an index from a list of cumulative probabilities
+    def _sample(self,cdf):
+        u=self._uniform()
+        k=0
+        while cdf[k]<=u:
+            k+=1
+        return k
+
+    def reset(self):
+        self.s=self._start_states[self._sample(self._start_cdf)]
+        self.elapsed_steps=0
+        return self.s
+
+    def step(self,action):
+        s=self.s
+        k=self._sample(self._cdf[s][action])
+        self.s=int(self._next_state[s][action][k])
+        done=bool(self._terminal[s][action][k])
+        self.elapsed_steps+=1
+        # truncate the episode after max_episode_steps, same as the gym TimeLimit wrapper
+        if not done and self.max_episode_steps is not None and self.elapsed_steps>=self.max_episode_steps:
+            return self.s,float(self._reward[s][action][k]),True,{'TimeLimit.truncated':True}
+        return self.s,float(self._reward[s][action][k]),done,{}
+
+    def close(self):
+        pass
+
+# define a function to create a FrozenLake environment, either from gym or the built-in array simulator
+def makeEnv(desc=None,fast_env=False,is_slippery=True,seed=None):
+    if fast_env:
+        return ArrayFrozenLake(desc,is_slippery=is_slippery,seed=seed)
+    import gym
+    if desc is None:
+        env=gym.make('FrozenLake-v1',is_slippery=is_slippery)
+    else:
+        env=gym.make('FrozenLake-v1',desc=desc,is_slippery=is_slippery)
+    if seed is not None:
+        seedGym(env,seed)
+    return env
+
+# define a function to seed a gym environment through its own api, env.seed in gym<=0.21 and reset(seed=seed) afterwards,
+# a SeedSequence or a Generator is turned into an int seed first
+def seedGym(env,seed):
+    seed=intSeed(seed)
+    if hasattr(getattr(env,'unwrapped',env),'seed'):
+        env.seed(seed)
+    else:
+        env.reset(seed=seed)
+
+# define a function to get the random stream of a training run on env, drawing from the one Generator of the run,
+# the same Generator samples the transitions of the environment, a RandomState for gym<=0.21
+# the environment is reseeded with rng if given, an int seed, a SeedSequence or a Generator
+def randomStream(env,rng=None):
+    if isinstance(env,ArrayFrozenLake):
+        if rng is not None:
+            env.seed(rng)
+        return env.random_stream
+    if rng is not None:
+        seedGym(env,rng)
+    return RandomStream(getattr(env,'unwrapped',env).np_random)
+
+# define a class to step n_envs independent FrozenLake episodes in lockstep with array operations
+class BatchFrozenLake:
+    def __init__(self,desc=None,n_envs=1024,map_name='4x4',is_slippery=True,max_episode_steps=MAX_EPISODE_STEPS,seed=None):
+        # compile the map once, accept an already compiled map as well
+        if isinstance(desc,CompiledMap):
+            self.model=desc
+        else:
+            self.model=compileMap(desc,map_name,is_slippery)
+        self.desc=self.model.desc
+        self.n_envs=n_envs
+        self.n_states=self.model.n_states
+        self.n_actions=self.model.n_actions
+        self.max_episode_steps=max_episode_steps
+        # current state and number of steps taken in the current episode of every lane
+        self.states=np.zeros(n_envs,dtype=np.int64)
+        self.elapsed_steps=np.zeros(n_envs,dtype=np.int64)
+        self.seed(seed)
+        self.reset()
+
+    def seed(self,seed=None):
+        self.np_random=makeRng(seed)
+        return [seed]
+
+    # define a function to sample n start states
+    def _startStates(self,n):
+        u=self.np_random.random(n)
+        return self.model.start_states[np.searchsorted(self.model.start_cdf,u,side='right')]
+
+    def reset(self):
+        self.states[:]=self._startStates(self.n_envs)
+        self.elapsed_steps[:]=0
+        return self.states.copy()
+
+    # take one action in every lane, finished lanes are reset automatically
+    # returns the next state reached by every lane (before the automatic reset), the gym rewards,
+    # the done flags and the truncation flags, the states to act from next are in self.states
+    def step(self,actions):
+        states=self.states
+        u=self.np_random.random(self.n_envs)
+        # index of the sampled outcome is the number of cumulative probabilities <= u
+        k=(self.model.cdf[states,actions]<=u[:,None]).sum(axis=1)
+        next_states=self.model.next_state[states,actions,k]
+        rewards=self.model.reward[states,actions,k]
+        dones=self.model.terminal[states,actions,k]
+        self.elapsed_steps+=1
+        # truncate episodes after max_episode_steps, same as the gym TimeLimit wrapper
+        if self.max_episode_steps is not None:
+            truncated=~dones&(self.elapsed_steps>=self.max_episode_steps)
+            dones=dones|truncated
+        else:
+            truncated=np.zeros(self.n_envs,dtype=bool)
+        # move every lane to its next state and restart the lanes whose episode is done
+        self.states=next_states.copy()
+        n_done=np.count_nonzero(dones)
+        if n_done:
+            self.states[dones]=self._startStates(n_done)
+            self.elapsed_steps[dones]=0
+        return next_states,rewards,dones,truncated
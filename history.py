@@ -0,0 +1,124 @@
+import os
+import numpy as np
+
+
+# layout of one episode record, 8 bytes per episode
+EPISODE_DTYPE=np.dtype([('reward','<f4'),('timesteps','<i4')])
+# the file starts with a header holding the magic bytes and the number of episodes written
+MAGIC=b'FLHIST01'
+HEADER_SIZE=64
+
+# define a class to store the reward and timesteps of every episode in an append-only memory-mapped file
+# the trainers write into the mapping directly, readers get zero-copy numpy views of the written episodes
+# the number of episodes is kept in the mapped header, so a crash loses at most the episodes not yet written
+class EpisodeHistory:
+    def __init__(self,path,capacity=1<<16,mode='a'):
+        if mode not in ('a','r'):
+            raise ValueError("mode must be 'a' or 'r', got {}".format(mode))
+        self.path=path
+        self.mode=mode
+        if not os.path.exists(path):
+            if mode=='r':
+                raise FileNotFoundError(path)
+            with open(path,'wb') as f:
+                f.write(MAGIC.ljust(HEADER_SIZE,b'\0'))
+                f.truncate(HEADER_SIZE+capacity*EPISODE_DTYPE.itemsize)
+        with open(path,'rb') as f:
+            if f.read(len(MAGIC))!=MAGIC:
+                raise ValueError('not an episode history file: {}'.format(path))
+        self._map()
+
+    # define a function to map the header and the records of the file, the file size sets the capacity
+    def _map(self):
+        file_mode='r' if self.mode=='r' else 'r+'
+        self._header=np.memmap(self.path,dtype='<u8',mode=file_mode,offset=len(MAGIC),shape=(1,))
+        capacity=(os.path.getsize(self.path)-HEADER_SIZE)//EPISODE_DTYPE.itemsize
+        self._records=np.memmap(self.path,dtype=EPISODE_DTYPE,mode=file_mode,offset=HEADER_SIZE,shape=(capacity,))
+        self.length=int(self._header[0])
+
+    @property
+    def capacity(self):
+        return len(self._records)
+
+    # define a function to double the size of the file and remap it
+    def _grow(self):
+        self.flush()
+        capacity=2*self.capacity
+        del self._records
+        with open(self.path,'r+b') as f:
+            f.truncate(HEADER_SIZE+capacity*EPISODE_DTYPE.itemsize)
+        self._map()
+
+    def append(self,reward,timesteps):
+        if self.length>=self.capacity:
+            self._grow()
+        self._records[self.length]=(reward,timesteps)
+        self.length+=1
+        self._header[0]=self.length
+
+    # define a function to append n episodes at once, returns writable views of their rewards and timesteps
+    # so a compiled kernel can write the episodes in place
+    def reserve(self,n):
+        while self.length+n>self.capacity:
+            self._grow()
+        start=self.length
+        self.length+=n
+        self._header[0]=self.length
+        return self._records['reward'][start:self.length],self._records['timesteps'][start:self.length]
+
+    # define a function to drop the episodes after the first length ones, used when resuming from a checkpoint
+    def truncate(self,length):
+        if length>self.length:
+            raise ValueError('cannot truncate {} episodes to {}'.format(self.length,length))
+        self.length=length
+        self._header[0]=length
+
+    def __len__(self):
+        return self.length
+
+    # views of the written episodes, no copy is made
+    @property
+    def rewards(self):
+        return self._records['reward'][:self.length]
+
+    @property
+    def timesteps(self):
+        return self._records['timesteps'][:self.length]
+
+    # define a function to reduce a column to at most n_points values, statistic of consecutive bins of episodes
+    # returns the index of the first episode of every bin and the statistic ('mean', 'min' or 'max') of the bin
+    def downsample(self,name='reward',n_points=1000,statistic='mean'):
+        values=self._records[name][:self.length]
+        if self.length==0:
+            return np.zeros(0,dtype=np.int64),np.zeros(0)
+        bin_size=-(-self.length//n_points)
+        starts=np.arange(0,self.length,bin_size)
+        if statistic=='mean':
+            reduced=np.add.reduceat(values,starts,dtype=np.float64)/np.diff(np.append(starts,self.length))
+        elif statistic=='min':
+            reduced=np.minimum.reduceat(values,starts)
+        elif statistic=='max':
+            reduced=np.maximum.reduceat(values,starts)
+        else:
+            raise ValueError('unknown statistic: {}'.format(statistic))
+        return starts,reduced
+
+    def flush(self):
+        if self.mode!='r':
+            self._header.flush()
+            self._records.flush()
+
+    def close(self):
+        self.flush()
+        del self._header
+        del self._records
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc):
+        self.close()
+
+# define a function to open an episode history for reading, e.g. from plotting code
+def openHistory(path):
+    return EpisodeHistory(path,mode='r')
@@ -0,0 +1,112 @@
+import os
+import numpy as np
+from time import time
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+from frozenlake_env import CompiledMap, compileMap, MAPS
+from kernels import HAVE_NUMBA, _tdEpisodes
+from rng import spawnRngs
+from training_config import DEFAULT_CONFIGS
+
+
+# define a function to run the episodes of one actor against its own copy of the environment, executed in a worker process
+# the Q table is the shared memory block shm_name, updated in place without locks by all actors (hogwild)
+# actor i of n_actors runs the global episodes i, i+n_actors, i+2*n_actors, ... so epsilon and alpha decay as in a single run
+# rng is the Generator of the actor, spawned from the seed of the run, model is the compiled map of the run, pickled to the actor
+def _actor(shm_name,shape,model,n_episodes,actor,n_actors,start_episode,max_steps,config,rng,sarsa,backend):
+    shm=shared_memory.SharedMemory(name=shm_name)
+    try:
+        Q=np.ndarray(shape,dtype=np.float64,buffer=shm.buf)
+        episodes=range(start_episode+actor,start_episode+n_episodes,n_actors)
+        epsilons=np.array([config.epsilonAt(episode) for episode in episodes])
+        alphas=np.array([config.alphaAt(episode) for episode in episodes])
+        rewards=np.zeros(len(episodes))
+        timesteps=np.zeros(len(episodes),dtype=np.int64)
+        kernel=_tdEpisodes if backend=='numba' else _tdEpisodes.py_func
+        t1=time()
+        n_frisbees=kernel(model.next_state,model.cdf,model.terminal,model.state_reward,model.start_states,model.start_cdf,
+                          Q,epsilons,alphas,config.gamma,max_steps,sarsa,rewards,timesteps,rng)
+        seconds=time()-t1
+        # drop the view before closing the shared memory
+        del Q
+    finally:
+        shm.close()
+    return rewards,timesteps,n_frisbees,seconds
+
+# define a function to train with n_actors processes updating one Q table in shared memory
+# returns Q, the rewards and timesteps of every episode in the order of the global episodes, n_frisbees and steps/sec
+def _runHogwild(desc,n_episodes,n_actors,max_steps,config,Q,start_episode,seed,sarsa,backend,is_slippery):
+    if isinstance(desc,CompiledMap):
+        model=desc
+    else:
+        if desc is None:
+            desc=MAPS['10x10']
+        model=compileMap(desc,is_slippery=is_slippery)
+    if n_actors is None:
+        n_actors=os.cpu_count() or 1
+    if backend=='auto':
+        backend='numba' if HAVE_NUMBA else 'python'
+    if backend=='numba' and not HAVE_NUMBA:
+        raise ImportError('numba is not installed')
+    shape=(model.n_states,model.n_actions)
+    # independent generators derived with SeedSequence.spawn, the first initializes Q and the others are the ones of the actors
+    rngs=spawnRngs(seed,n_actors+1)
+    shm=shared_memory.SharedMemory(create=True,size=int(np.prod(shape))*8)
+    try:
+        shared_Q=np.ndarray(shape,dtype=np.float64,buffer=shm.buf)
+        if Q is None:
+            # initialize the Q table the same way as the trainers, 0 action values for terminal states
+            shared_Q[...]=rngs[0].uniform(low=0.0,high=1e-3,size=shape)
+            shared_Q[model.state_terminal,:]=0.0
+        else:
+            shared_Q[...]=Q
+        t1=time()
+        with ProcessPoolExecutor(max_workers=n_actors) as executor:
+            futures=[executor.submit(_actor,shm.name,shape,model,n_episodes,actor,n_actors,start_episode,max_steps,
+                                     config,rngs[actor+1],sarsa,backend) for actor in range(n_actors)]
+            results=[future.result() for future in futures]
+        seconds=time()-t1
+        Q=shared_Q.copy()
+        del shared_Q
+    finally:
+        shm.close()
+        shm.unlink()
+    # interleave the episodes of the actors back into the global episode order
+    rewards=np.zeros(n_episodes)
+    timesteps=np.zeros(n_episodes,dtype=np.int64)
+    for actor,(actor_rewards,actor_timesteps,_,_) in enumerate(results):
+        rewards[actor::n_actors]=actor_rewards
+        timesteps[actor::n_actors]=actor_timesteps
+    n_frisbees=sum(result[2] for result in results)
+    # steps per second over the wall time of the whole run, including starting the processes
+    steps_per_sec=timesteps.sum()/seconds
+    return Q,rewards,timesteps,n_frisbees,steps_per_sec
+
+# define a function to implement hogwild Q-learning with n_actors processes, backend is 'auto', 'numba' or 'python'
+def hogwild_Q_learning(desc=None,n_episodes=20000,n_actors=None,max_steps=100,config=None,Q=None,start_episode=0,seed=None,backend='auto',is_slippery=True):
+    if config is None:
+        config=DEFAULT_CONFIGS['Q_learning_extended']
+    return _runHogwild(desc,n_episodes,n_actors,max_steps,config,Q,start_episode,seed,False,backend,is_slippery)
+
+# define a function to implement hogwild sarsa with n_actors processes, backend is 'auto', 'numba' or 'python'
+def hogwild_sarsa(desc=None,n_episodes=20000,n_actors=None,max_steps=100,config=None,Q=None,start_episode=0,seed=None,backend='auto',is_slippery=True):
+    if config is None:
+        config=DEFAULT_CONFIGS['sarsa_extended']
+    return _runHogwild(desc,n_episodes,n_actors,max_steps,config,Q,start_episode,seed,True,backend,is_slippery)
+
+def main():
+    print('hogwild.py')
+    from map_generator import generateMap
+    desc=generateMap(100,0.1,seed=0)
+    # steps/sec for 1 actor up to one actor per core
+    n_cores=os.cpu_count() or 1
+    n_actors=1
+    while True:
+        Q,rewards,timesteps,n_frisbees,steps_per_sec=hogwild_Q_learning(desc,20000,n_actors,max_steps=400,seed=0)
+        print('{} actors: {} steps, {:.0f} steps/s, {} frisbees obtained'.format(n_actors,timesteps.sum(),steps_per_sec,n_frisbees))
+        if n_actors>=n_cores:
+            break
+        n_actors=min(2*n_actors,n_cores)
+
+if __name__=='__main__':
+    main()
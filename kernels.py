@@ -0,0 +1,151 @@
+import numpy as np
+from time import time
+from frozenlake_env import ArrayFrozenLake, CompiledMap, mapOf, MAPS
+from rng import makeRng
+from training_config import DEFAULT_CONFIGS
+try:
+    from numba import njit
+    HAVE_NUMBA=True
+except ImportError:
+    HAVE_NUMBA=False
+
+
+# define a decorator compiling a function with numba when it is installed, the plain python function is kept as .py_func
+def jit(function):
+    if HAVE_NUMBA:
+        return njit(cache=True)(function)
+    function.py_func=function
+    return function
+
+# define a function to choose an action from state using epsilon-greedy policy, drawing from the Generator rng
+@jit
+def _epsilonGreedy(Q,state,epsilon,rng):
+    # exploit if the sampled probability is greater than epsilon otherwise explore
+    if rng.random()>epsilon:
+        # get greedy action, the first one in case of ties as np.argmax
+        best=0
+        for a in range(1,Q.shape[1]):
+            if Q[state,a]>Q[state,best]:
+                best=a
+        return best
+    return rng.integers(0,Q.shape[1])
+
+# define a function to sample an index from cumulative probabilities
+@jit
+def _sample(cdf,rng):
+    u=rng.random()
+    k=0
+    while cdf[k]<=u:
+        k+=1
+    return k
+
+# define a function to run whole training runs of tabular Q-learning (sarsa=False) or sarsa (sarsa=True) as a single kernel
+# epsilons[i] and alphas[i] are epsilon and alpha of the i-th episode, the rewards and timesteps of every episode are written to rewards_out and timesteps_out
+# the transitions and the actions are drawn from the one Generator rng of the run
+@jit
+def _tdEpisodes(next_state,cdf,terminal,state_rewards,start_states,start_cdf,Q,epsilons,alphas,gamma,max_steps,sarsa,rewards_out,timesteps_out,rng):
+    n_frisbees=0
+    for episode in range(epsilons.shape[0]):
+        epsilon=epsilons[episode]
+        alpha=alphas[episode]
+        # reset state before performing any new episode
+        state=start_states[_sample(start_cdf,rng)]
+        # choose A from S using epsilon-greedy policy
+        action=_epsilonGreedy(Q,state,epsilon,rng)
+        total_rewards=0.0
+        steps=0
+        for step in range(max_steps):
+            steps+=1
+            if not sarsa:
+                action=_epsilonGreedy(Q,state,epsilon,rng)
+            # take action A in the environment
+            k=_sample(cdf[state,action],rng)
+            new_state=next_state[state,action,k]
+            done=terminal[state,action,k]
+            reward=state_rewards[new_state]
+            if reward==1.0:
+                n_frisbees+=1
+            if sarsa:
+                # choose A' from S' using epsilon-greedy policy
+                next_action=_epsilonGreedy(Q,new_state,epsilon,rng)
+                target=reward+gamma*Q[new_state,next_action]
+            else:
+                next_action=0
+                target=reward+gamma*np.max(Q[new_state,:])
+            # update estimated action value Q[S,A]
+            Q[state,action]+=alpha*(target-Q[state,action])
+            total_rewards+=reward
+            # redefine state S to be new state S' and, for sarsa, action A to be A'
+            state=new_state
+            action=next_action
+            if done:
+                break
+        rewards_out[episode]=total_rewards
+        timesteps_out[episode]=steps
+    return n_frisbees
+
+# define a function to run tabular Q-learning or sarsa with the compiled kernel, falling back to python when numba is unavailable
+# returns Q, rewards, timesteps and n_frisbees as the extended trainers, rewards and timesteps are views of history if given
+# rng is an int seed, a SeedSequence or a Generator, the generator of the array simulator env by default
+def _runKernel(env,n_episodes,max_steps,config,Q,start_episode,rng,sarsa,backend,history):
+    # the map of a gym env comes with its slipperiness, read from its transition table
+    if isinstance(env,CompiledMap):
+        model=env
+    else:
+        model=mapOf(env)
+    state_rewards=model.state_reward
+    # one generator for the run, used to initialize Q and by the kernel
+    if rng is None and isinstance(env,ArrayFrozenLake):
+        rng=env.np_random
+    rng=makeRng(rng)
+    if Q is None:
+        # initialize the Q table the same way as the trainers, 0 action values for terminal states
+        Q=rng.uniform(low=0.0,high=1e-3,size=(model.n_states,model.n_actions))
+        Q[model.state_terminal,:]=0.0
+    else:
+        Q=np.array(Q,dtype=np.float64)
+    # epsilon and alpha of every episode
+    epsilons=np.array([config.epsilonAt(episode) for episode in range(start_episode,start_episode+n_episodes)])
+    alphas=np.array([config.alphaAt(episode) for episode in range(start_episode,start_episode+n_episodes)])
+    # the kernel writes the episodes straight into the on-disk history if given
+    if history is not None:
+        rewards,timesteps=history.reserve(n_episodes)
+    else:
+        rewards=np.zeros(n_episodes)
+        timesteps=np.zeros(n_episodes,dtype=np.int64)
+    if backend=='auto':
+        backend='numba' if HAVE_NUMBA else 'python'
+    if backend=='numba' and not HAVE_NUMBA:
+        raise ImportError('numba is not installed')
+    kernel=_tdEpisodes if backend=='numba' else _tdEpisodes.py_func
+    n_frisbees=kernel(model.next_state,model.cdf,model.terminal,state_rewards,model.start_states,model.start_cdf,
+                      Q,epsilons,alphas,config.gamma,max_steps,sarsa,rewards,timesteps,rng)
+    return Q,rewards,timesteps,n_frisbees
+
+# define a function to implement Q-learning as a single compiled kernel, backend is 'auto', 'numba' or 'python'
+def jit_Q_learning(env,n_episodes=20000,max_steps=100,config=None,Q=None,start_episode=0,rng=None,backend='auto',history=None):
+    if config is None:
+        config=DEFAULT_CONFIGS['Q_learning_extended']
+    return _runKernel(env,n_episodes,max_steps,config,Q,start_episode,rng,False,backend,history)
+
+# define a function to implement sarsa as a single compiled kernel, backend is 'auto', 'numba' or 'python'
+def jit_sarsa(env,n_episodes=20000,max_steps=100,config=None,Q=None,start_episode=0,rng=None,backend='auto',history=None):
+    if config is None:
+        config=DEFAULT_CONFIGS['sarsa_extended']
+    return _runKernel(env,n_episodes,max_steps,config,Q,start_episode,rng,True,backend,history)
+
+def main():
+    print('kernels.py')
+    print('numba available: {}'.format(HAVE_NUMBA))
+    env=ArrayFrozenLake(MAPS['10x10'])
+    for name,train in (('Q_learning',jit_Q_learning),('sarsa',jit_sarsa)):
+        # first call compiles the kernel
+        train(env,1,rng=0)
+        t1=time()
+        Q,rewards,timesteps,n_frisbees=train(env,20000,rng=0)
+        t2=time()
+        print('{}: {} episodes, {} steps in {:.3f}s ({:.0f} steps/s)'.format(name,len(rewards),timesteps.sum(),t2-t1,timesteps.sum()/(t2-t1)))
+        print('{} frisbees obtained, score over time: {}'.format(n_frisbees,rewards.mean()))
+
+if __name__=='__main__':
+    main()
@@ -1,14 +1,51 @@
-import mc
-import sarsa
-import Q_learning
-import mc_extended
-import sarsa_extended
-import Q_learning_extended
-
-if __name__=='__main__':
-	mc.main()
-	sarsa.main()
-	Q_learning.main()
-	mc_extended.main()
-	sarsa_extended.main()
-	Q_learning_extended.main()
+import os
+import argparse
+from metrics import createMetrics
+from training import RUNS, DEFAULT_RUNS, run
+from profiling import PhaseTimes, profileCall
+
+# define a function to give every run its own output file, the run name is added as suffix
+def pathFor(path,name):
+	root,ext=os.path.splitext(path)
+	return '{}_{}{}'.format(root,name,ext)
+
+# define a function to create the metrics collector of one run
+def metricsFor(args,name):
+	if args.metrics=='stdout':
+		return createMetrics('stdout',args.flush_every,args.flush_interval,streaming=args.streaming_stats)
+	return createMetrics(pathFor(args.metrics,name),args.flush_every,args.flush_interval,streaming=args.streaming_stats)
+
+if __name__=='__main__':
+	parser=argparse.ArgumentParser()
+	# runs to execute, the ones of the six trainer scripts by default
+	parser.add_argument('--runs',nargs='+',default=list(DEFAULT_RUNS),choices=[name for name,agent_name,map_name,n_episodes in RUNS])
+	# number of episodes of every run, the one of the trainer script by default
+	parser.add_argument('--episodes',type=int,default=None)
+	parser.add_argument('--seed',type=int,default=None)
+	# run the trainers on the built-in array simulator instead of gym.make('FrozenLake-v1')
+	parser.add_argument('--fast-env',action='store_true')
+	# where to write the training metrics: stdout, a .csv or a .jsonl file
+	parser.add_argument('--metrics',default='stdout')
+	# flush the metrics every n episodes, and at most once every n seconds if given
+	parser.add_argument('--flush-every',type=int,default=1000)
+	parser.add_argument('--flush-interval',type=float,default=None)
+	# also report the ewma, mean, standard deviation and quantiles of every metric
+	parser.add_argument('--streaming-stats',action='store_true')
+	# report the time spent stepping the environment, selecting actions, updating Q and on bookkeeping, and the steps per second
+	parser.add_argument('--phase-times',action='store_true')
+	# dump the cProfile statistics of every run to this file with the run name as suffix, in the pstats format
+	parser.add_argument('--profile',default=None)
+	args=parser.parse_args()
+	for name,agent_name,map_name,n_episodes in RUNS:
+		if name not in args.runs:
+			continue
+		print(name)
+		metrics=metricsFor(args,name)
+		kwargs={'fast_env':args.fast_env,'metrics':metrics,'seed':args.seed}
+		if args.phase_times:
+			kwargs['phase_times']=PhaseTimes()
+		if args.profile is not None:
+			profileCall(pathFor(args.profile,name),run,agent_name,map_name,args.episodes or n_episodes,**kwargs)
+		else:
+			run(agent_name,map_name,args.episodes or n_episodes,**kwargs)
+		metrics.close()
@@ -0,0 +1,41 @@
+import numpy as np
+from collections import deque
+
+
+# define a function to check that the goal can be reached from the start without stepping into a hole
+def isSolvable(desc):
+    desc=np.asarray(desc,dtype='c')
+    n_row,n_col=desc.shape
+    flat_desc=desc.ravel()
+    # breadth first search over the 4 neighbours of every frozen state
+    visited=np.zeros(n_row*n_col,dtype=bool)
+    frontier=deque(np.flatnonzero(flat_desc==b'S').tolist())
+    visited[list(frontier)]=True
+    while frontier:
+        s=frontier.popleft()
+        if flat_desc[s]==b'G':
+            return True
+        row,col=divmod(s,n_col)
+        for new_row,new_col in ((row,col-1),(row+1,col),(row,col+1),(row-1,col)):
+            if 0<=new_row<n_row and 0<=new_col<n_col:
+                new_s=new_row*n_col+new_col
+                if not visited[new_s] and flat_desc[new_s]!=b'H':
+                    visited[new_s]=True
+                    frontier.append(new_s)
+    return False
+
+# define a function to generate a solvable FrozenLake map with the start in the top left and the goal in the bottom right corner
+# size is an int for square maps or a tuple (n_row,n_col), hole_density is the probability of each other state being a hole
+def generateMap(size=10,hole_density=0.2,seed=None,max_tries=100):
+    if isinstance(size,int):
+        size=(size,size)
+    n_row,n_col=size
+    rng=np.random.default_rng(seed)
+    for _ in range(0,max_tries):
+        desc=np.where(rng.random((n_row,n_col))<hole_density,b'H',b'F')
+        desc[0,0]=b'S'
+        desc[-1,-1]=b'G'
+        if isSolvable(desc):
+            # same list of strings format as the maps of MAPS
+            return [row.tobytes().decode() for row in desc]
+    raise ValueError('no solvable {}x{} map with hole density {} found in {} tries'.format(n_row,n_col,hole_density,max_tries))
@@ -0,0 +1,414 @@
+import csv
+import json
+import os
+import sys
+import numpy as np
+from time import time
+
+
+# counters of the training loops, reported from the first record on
+COUNTERS=('frisbees',)
+
+# define a class to keep the running mean of the last window values of a metric
+class RollingMean:
+    def __init__(self,window=100):
+        self.window=window
+        self.values=[0.0]*window
+        self.total=0.0
+        # number of values recorded so far
+        self.count=0
+
+    def add(self,value):
+        i=self.count%self.window
+        self.total+=value-self.values[i]
+        self.values[i]=value
+        self.count+=1
+
+    # define a function to add the values of several episodes at once, only the last window values stay in the window
+    def addMany(self,values):
+        values=np.asarray(values,dtype=np.float64)
+        n=len(values)
+        if n==0:
+            return
+        last=values[-self.window:]
+        window_values=np.array(self.values)
+        window_values[(self.count+n-len(last)+np.arange(len(last)))%self.window]=last
+        self.values=window_values.tolist()
+        self.total=float(window_values.sum())
+        self.count+=n
+
+    @property
+    def mean(self):
+        n=min(self.count,self.window)
+        return self.total/n if n else 0.0
+
+    def getState(self):
+        return {'window':self.window,'values':list(self.values),'total':self.total,'count':self.count}
+
+    def setState(self,state):
+        self.window=state['window']
+        self.values=list(state['values'])
+        self.total=state['total']
+        self.count=state['count']
+
+    # fields of the metric in the flushed records
+    def asdict(self,name):
+        return {'mean_'+name:self.mean}
+
+# define a class to keep an exponentially weighted moving average, alpha is the weight of the newest value
+class EWMA:
+    def __init__(self,alpha=0.01):
+        self.alpha=alpha
+        self.value=0.0
+        self.count=0
+
+    def add(self,value):
+        # the first value initializes the average instead of decaying from 0
+        if self.count==0:
+            self.value=float(value)
+        else:
+            self.value+=self.alpha*(value-self.value)
+        self.count+=1
+
+    def getState(self):
+        return {'alpha':self.alpha,'value':self.value,'count':self.count}
+
+    def setState(self,state):
+        self.alpha=state['alpha']
+        self.value=state['value']
+        self.count=state['count']
+
+# define a class to keep the mean and variance of all values with Welford's algorithm
+class RunningVariance:
+    def __init__(self):
+        self.count=0
+        self.mean=0.0
+        # sum of squared differences from the mean
+        self.m2=0.0
+
+    def add(self,value):
+        self.count+=1
+        delta=value-self.mean
+        self.mean+=delta/self.count
+        self.m2+=delta*(value-self.mean)
+
+    @property
+    def variance(self):
+        return self.m2/(self.count-1) if self.count>1 else 0.0
+
+    @property
+    def std(self):
+        return self.variance**0.5
+
+    def getState(self):
+        return {'count':self.count,'mean':self.mean,'m2':self.m2}
+
+    def setState(self,state):
+        self.count=state['count']
+        self.mean=state['mean']
+        self.m2=state['m2']
+
+# define a class to estimate a quantile of all values with the P-square algorithm of Jain and Chlamtac,
+# five markers are kept whatever the number of values
+class QuantileSketch:
+    def __init__(self,q=0.5):
+        self.q=q
+        self.count=0
+        # heights and positions of the markers, and desired positions with their increments
+        self.heights=[]
+        self.positions=[1,2,3,4,5]
+        self.desired=[1,1+2*q,1+4*q,3+2*q,5]
+        self.increments=[0,q/2,q,(1+q)/2,1]
+
+    def add(self,value):
+        self.count+=1
+        heights=self.heights
+        # the first five values are the initial marker heights
+        if self.count<=5:
+            heights.append(float(value))
+            heights.sort()
+            return
+        # find the cell of the value, moving the extreme markers if it is outside them
+        if value<heights[0]:
+            heights[0]=float(value)
+            k=0
+        elif value>=heights[4]:
+            heights[4]=float(value)
+            k=3
+        else:
+            k=0
+            while value>=heights[k+1]:
+                k+=1
+        positions=self.positions
+        for i in range(k+1,5):
+            positions[i]+=1
+        for i in range(0,5):
+            self.desired[i]+=self.increments[i]
+        # adjust the heights of the middle markers that are off their desired position by one or more
+        for i in range(1,4):
+            d=self.desired[i]-positions[i]
+            if (d>=1 and positions[i+1]-positions[i]>1) or (d<=-1 and positions[i-1]-positions[i]<-1):
+                d=1 if d>0 else -1
+                # piecewise-parabolic prediction, linear if it would not keep the heights ordered
+                height=heights[i]+d/(positions[i+1]-positions[i-1])*(
+                    (positions[i]-positions[i-1]+d)*(heights[i+1]-heights[i])/(positions[i+1]-positions[i])+
+                    (positions[i+1]-positions[i]-d)*(heights[i]-heights[i-1])/(positions[i]-positions[i-1]))
+                if not heights[i-1]<height<heights[i+1]:
+                    height=heights[i]+d*(heights[i+d]-heights[i])/(positions[i+d]-positions[i])
+                heights[i]=height
+                positions[i]+=d
+
+    @property
+    def value(self):
+        if self.count==0:
+            return 0.0
+        if self.count<=5:
+            return self.heights[min(int(self.q*self.count),self.count-1)]
+        return self.heights[2]
+
+    def getState(self):
+        return {'q':self.q,'count':self.count,'heights':list(self.heights),'positions':list(self.positions),'desired':list(self.desired)}
+
+    def setState(self,state):
+        self.__init__(state['q'])
+        self.count=state['count']
+        self.heights=list(state['heights'])
+        self.positions=list(state['positions'])
+        self.desired=list(state['desired'])
+
+# define a class to keep the windowed mean, ewma, mean and variance and quantiles of a metric, all updated in O(1)
+class StreamingStats:
+    def __init__(self,window=100,ewma_alpha=0.01,quantiles=(0.5,0.9)):
+        self.window=window
+        self.rolling=RollingMean(window)
+        self.ewma=EWMA(ewma_alpha)
+        self.variance=RunningVariance()
+        self.quantiles=[QuantileSketch(q) for q in quantiles]
+
+    def add(self,value):
+        self.rolling.add(value)
+        self.ewma.add(value)
+        self.variance.add(value)
+        for sketch in self.quantiles:
+            sketch.add(value)
+
+    # the ewma, variance and quantiles are updated value by value
+    def addMany(self,values):
+        for value in np.asarray(values,dtype=np.float64).tolist():
+            self.add(value)
+
+    @property
+    def mean(self):
+        return self.rolling.mean
+
+    def asdict(self,name):
+        record={'mean_'+name:self.rolling.mean,
+                'ewma_'+name:self.ewma.value,
+                'total_mean_'+name:self.variance.mean,
+                'std_'+name:self.variance.std}
+        for sketch in self.quantiles:
+            record['p{:g}_{}'.format(100*sketch.q,name)]=sketch.value
+        return record
+
+    def getState(self):
+        return {'rolling':self.rolling.getState(),'ewma':self.ewma.getState(),'variance':self.variance.getState(),
+                'quantiles':[sketch.getState() for sketch in self.quantiles]}
+
+    def setState(self,state):
+        self.rolling.setState(state['rolling'])
+        self.window=self.rolling.window
+        self.ewma.setState(state['ewma'])
+        self.variance.setState(state['variance'])
+        self.quantiles=[QuantileSketch() for _ in state['quantiles']]
+        for sketch,sketch_state in zip(self.quantiles,state['quantiles']):
+            sketch.setState(sketch_state)
+
+# define a class to write metric records to stdout
+class StdoutSink:
+    def __init__(self,stream=None):
+        self.stream=stream
+
+    def write(self,record):
+        stream=self.stream or sys.stdout
+        stream.write(', '.join('{}: {}'.format(key,_format(value)) for key,value in record.items())+'\n')
+
+    # final summaries are printed one 'name: value' line each
+    def summary(self,record):
+        stream=self.stream or sys.stdout
+        for key,value in record.items():
+            stream.write('{}: {}\n'.format(key,value))
+
+    def close(self):
+        pass
+
+# define a class to write metric records as rows of a csv file, the columns are the keys of the first record
+# the final summaries have other keys, they are written as 'name,value' rows of a second csv file, path with a _summary suffix
+class CSVSink:
+    def __init__(self,path):
+        self.path=path
+        self.file=open(path,'w',newline='')
+        self.writer=None
+        self.summary_file=None
+
+    def write(self,record):
+        if self.writer is None:
+            self.writer=csv.DictWriter(self.file,fieldnames=list(record),extrasaction='ignore')
+            self.writer.writeheader()
+        self.writer.writerow(record)
+        self.file.flush()
+
+    def summary(self,record):
+        if self.summary_file is None:
+            root,ext=os.path.splitext(self.path)
+            self.summary_file=open(root+'_summary'+ext,'w',newline='')
+            self.summary_writer=csv.writer(self.summary_file)
+            self.summary_writer.writerow(['name','value'])
+        for key,value in record.items():
+            self.summary_writer.writerow([key,value])
+        self.summary_file.flush()
+
+    def close(self):
+        self.file.close()
+        if self.summary_file is not None:
+            self.summary_file.close()
+
+# define a class to write metric records as one json object per line
+class JSONLinesSink:
+    def __init__(self,path):
+        self.file=open(path,'w')
+
+    def write(self,record):
+        self.file.write(json.dumps(record)+'\n')
+        self.file.flush()
+
+    def summary(self,record):
+        self.write(dict(record,summary=True))
+
+    def close(self):
+        self.file.close()
+
+def _format(value):
+    if isinstance(value,float):
+        return '{:.4g}'.format(value)
+    return value
+
+# define a class to collect counters and rolling means in memory and flush them to sinks periodically
+# the training loops only call increment and record, flushing happens at most once every flush_every episodes
+# and, if flush_interval is given, at most once every flush_interval seconds
+# with streaming=True every recorded metric also keeps an ewma, mean and variance and quantiles
+# counters start at 0 so they are in every record, from the first one that fixes the columns of a csv file
+class Metrics:
+    def __init__(self,sinks=None,flush_every=1000,flush_interval=None,window=100,streaming=False,ewma_alpha=0.01,quantiles=(0.5,0.9),
+                 counters=COUNTERS):
+        if sinks is None:
+            sinks=[StdoutSink()]
+        self.sinks=sinks
+        self.flush_every=flush_every
+        self.flush_interval=flush_interval
+        self.window=window
+        self.streaming=streaming
+        self.ewma_alpha=ewma_alpha
+        self.quantiles=quantiles
+        self.counters=dict.fromkeys(counters,0)
+        self.rolling={}
+        self.episodes=0
+        self._last_flush_episode=0
+        self._last_flush_time=time()
+
+    def increment(self,name,n=1):
+        self.counters[name]=self.counters.get(name,0)+n
+
+    def _newStats(self):
+        if self.streaming:
+            return StreamingStats(self.window,self.ewma_alpha,self.quantiles)
+        return RollingMean(self.window)
+
+    def record(self,name,value):
+        rolling=self.rolling.get(name)
+        if rolling is None:
+            rolling=self.rolling[name]=self._newStats()
+        rolling.add(value)
+
+    # define a function to record the values of several episodes at once, e.g. the episodes finished by the lanes of a batch
+    def recordMany(self,name,values):
+        rolling=self.rolling.get(name)
+        if rolling is None:
+            rolling=self.rolling[name]=self._newStats()
+        rolling.addMany(values)
+
+    # define a function to return the live statistics of a metric, e.g. to track convergence during a run
+    def stats(self,name):
+        return self.rolling.get(name)
+
+    # define a function to mark the end of an episode, or of n episodes, and flush if enough episodes or time have passed
+    def endEpisode(self,episode=None,n=1):
+        self.episodes+=n
+        if self.flush_every and self.episodes-self._last_flush_episode>=self.flush_every:
+            if self.flush_interval is None or time()-self._last_flush_time>=self.flush_interval:
+                self.flush(episode)
+
+    def snapshot(self,episode=None):
+        record={'episode':self.episodes if episode is None else episode}
+        record.update(self.counters)
+        for name,rolling in self.rolling.items():
+            record.update(rolling.asdict(name))
+        return record
+
+    def flush(self,episode=None):
+        record=self.snapshot(episode)
+        for sink in self.sinks:
+            sink.write(record)
+        self._last_flush_episode=self.episodes
+        self._last_flush_time=time()
+
+    # define a function to return the counters and rolling means as plain python objects, used by checkpoints
+    # streaming records which kind of statistics the rolling states are the states of
+    def getState(self):
+        return {'episodes':self.episodes,
+                'last_flush_episode':self._last_flush_episode,
+                'counters':dict(self.counters),
+                'streaming':self.streaming,
+                'rolling':{name:rolling.getState() for name,rolling in self.rolling.items()}}
+
+    # define a function to continue collecting from a state returned by getState
+    # the statistics are rebuilt with the kind they were saved with, which the metrics keep collecting from then on
+    def setState(self,state):
+        self.episodes=state['episodes']
+        self.counters=dict(state['counters'])
+        streaming=state.get('streaming')
+        if streaming is None and state['rolling']:
+            # states saved before the kind was recorded, the state of a StreamingStats has an ewma
+            streaming=any('ewma' in rolling_state for rolling_state in state['rolling'].values())
+        if streaming is not None:
+            self.streaming=streaming
+        self.rolling={}
+        for name,rolling_state in state['rolling'].items():
+            rolling=self.rolling[name]=self._newStats()
+            rolling.setState(rolling_state)
+        self._last_flush_episode=state['last_flush_episode']
+
+    # define a function to send the final summary of a run to the sinks
+    def summary(self,record):
+        for sink in self.sinks:
+            sink.summary(record)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+# define a function to create a metrics collector from a run configuration
+# output is 'stdout', a path ending with .csv or .jsonl, or a list of those
+def createMetrics(output='stdout',flush_every=1000,flush_interval=None,window=100,streaming=False):
+    if isinstance(output,str):
+        output=[output]
+    sinks=[]
+    for target in output:
+        if target=='stdout':
+            sinks.append(StdoutSink())
+        elif target.endswith('.csv'):
+            sinks.append(CSVSink(target))
+        elif target.endswith('.jsonl'):
+            sinks.append(JSONLinesSink(target))
+        else:
+            raise ValueError('unknown metrics output: {}'.format(target))
+    return Metrics(sinks,flush_every,flush_interval,window,streaming)
@@ -0,0 +1,69 @@
+import os
+import contextlib
+import numpy as np
+from time import time
+from concurrent.futures import ProcessPoolExecutor
+from frozenlake_env import makeEnv, MAPS
+
+
+# trainers that can be run over several seeds, name: (module, function)
+TRAINERS={'sarsa_extended':('sarsa_extended','sarsa_extended'),
+          'Q_learning_extended':('Q_learning_extended','Q_learning_extended'),
+          'monteCarloControl':('mc_extended','monteCarloControl')}
+
+# define a function to derive n independent seeds from a base seed, the SeedSequence children themselves,
+# which makeEnv seeds the generator of the environment with
+def spawnSeeds(seed,n_seeds):
+    return np.random.SeedSequence(seed).spawn(n_seeds)
+
+# define a function to import the function of a trainer by name
+def getTrainer(trainer):
+    module_name,function_name=TRAINERS[trainer]
+    module=__import__(module_name)
+    return getattr(module,function_name)
+
+# define a function to run one seed of a trainer, executed in a worker process
+def runSeed(trainer,seed,n_episodes=None,desc=None,fast_env=True,quiet=True,kwargs=None):
+    if desc is None:
+        desc=MAPS['10x10']
+    # the trainers draw from the generator of the environment, seeded once for the whole run
+    env=makeEnv(desc,fast_env=fast_env,seed=seed)
+    kwargs=dict(kwargs or {})
+    if n_episodes is not None:
+        kwargs['n_episodes']=n_episodes
+    train=getTrainer(trainer)
+    # silence the per-episode output of the trainer
+    if quiet:
+        with open(os.devnull,'w') as devnull, contextlib.redirect_stdout(devnull):
+            result=train(env,**kwargs)
+    else:
+        result=train(env,**kwargs)
+    # monte carlo control only returns the policy
+    if trainer=='monteCarloControl':
+        return {'policy':np.asarray(result)}
+    Q,rewards,timesteps,n_frisbees=result
+    return {'Q':np.asarray(Q),'rewards':np.asarray(rewards,dtype=np.float64),'timesteps':np.asarray(timesteps,dtype=np.int64),'n_frisbees':n_frisbees}
+
+# define a function to run n_seeds seeds of a trainer in parallel and stack the results
+def runSeeds(trainer='Q_learning_extended',n_seeds=8,seed=0,n_episodes=None,desc=None,fast_env=True,max_workers=None,quiet=True,**kwargs):
+    seeds=spawnSeeds(seed,n_seeds)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures=[executor.submit(runSeed,trainer,s,n_episodes,desc,fast_env,quiet,kwargs) for s in seeds]
+        results=[future.result() for future in futures]
+    # stack the results of all seeds along a new first axis
+    stacked={key:np.stack([result[key] for result in results]) for key in results[0]}
+    # the SeedSequence of every seed, runSeed(trainer,seeds[i]) reproduces the run of seed i
+    stacked['seeds']=seeds
+    return stacked
+
+def main():
+    print('multi_seed.py')
+    t1=time()
+    results=runSeeds('Q_learning_extended',n_seeds=os.cpu_count() or 1,n_episodes=2000)
+    t2=time()
+    print('{} seeds in {:.3f}s'.format(len(results['seeds']),t2-t1))
+    print('score over time per seed: {}'.format(results['rewards'].mean(axis=1)))
+    print('average timesteps taken: {}'.format(results['timesteps'].mean()))
+
+if __name__=='__main__':
+    main()
@@ -0,0 +1,83 @@
+import numpy as np
+from time import time
+from frozenlake_env import MAPS, MAX_EPISODE_STEPS
+from dp import asCompiledMap, policyTransitions, value_iteration
+from tabular import policyToArray
+try:
+    import scipy.sparse
+    import scipy.sparse.linalg
+except ImportError:
+    scipy=None
+
+
+# number of states above which the sparse solver is used by default
+SPARSE_THRESHOLD=400
+
+# define a function to convert a policy to action probabilities of shape (states, actions)
+# policy may be a {state: {action: float}} dict, an array of action probabilities or an array of one action per state
+def policyProbabilities(policy,n_states,n_actions):
+    policy=policyToArray(policy)
+    if policy.ndim==1:
+        # deterministic policy, one action per state
+        probabilities=np.zeros((n_states,n_actions))
+        probabilities[np.arange(n_states),policy.astype(np.int64)]=1.0
+        return probabilities
+    probabilities=np.array(policy,dtype=np.float64)
+    # normalize the rows, the epsilon-soft policy of createRandomPolicyDict sums to 0.8
+    return probabilities/probabilities.sum(axis=1,keepdims=True)
+
+# define a function to solve (I-gamma*P)x=b with a dense or sparse solver
+def _solve(P,b,gamma,sparse):
+    n=P.shape[0]
+    if sparse:
+        return scipy.sparse.linalg.spsolve((scipy.sparse.identity(n,format='csc')-gamma*P).tocsc(),b)
+    return np.linalg.solve(np.eye(n)-gamma*P,b)
+
+# define a function to evaluate a policy exactly on the absorbing markov chain of a map
+# returns the win probability and expected episode length from the start state, the same per state,
+# and the discounted state values under the repo's reward scheme (+1 goal, -1 hole)
+# episodes are truncated after max_episode_steps as in gym, max_episode_steps=None solves the untruncated chain,
+# which requires the policy to reach a hole or the goal with probability 1
+def evaluate_policy_exact(policy,desc=None,gamma=0.8,max_episode_steps=MAX_EPISODE_STEPS,is_slippery=True,sparse=None):
+    if desc is None:
+        desc=MAPS['4x4']
+    model=asCompiledMap(desc,is_slippery)
+    n_states=model.n_states
+    if sparse is None:
+        sparse=scipy is not None and n_states>SPARSE_THRESHOLD
+    probabilities=policyProbabilities(policy,n_states,model.n_actions)
+    P,r=policyTransitions(model,probabilities,sparse=sparse)
+    # probability of reaching the goal in the next step from every state
+    goal=np.array(model.desc.ravel()==b'G',dtype=np.float64)
+    goal_next=P@goal
+    transient=np.array(~model.state_terminal,dtype=np.float64)
+    if max_episode_steps is None:
+        # win probability w and expected length L satisfy w=goal_next+P*w and L=1+P*L on the transient states
+        win=_solve(P,goal_next,1.0,sparse)
+        length=_solve(P,transient,1.0,sparse)
+    else:
+        # backward recursion over the number of steps left in the episode
+        win=np.zeros(n_states)
+        length=np.zeros(n_states)
+        for _ in range(0,max_episode_steps):
+            win=goal_next+P@win
+            length=transient+P@length
+    # discounted state values
+    values=_solve(P,r,gamma,sparse)
+    return {'win_probability':float(model.start_distribution@win),
+            'expected_length':float(model.start_distribution@length),
+            'state_win_probability':win,
+            'state_expected_length':length,
+            'values':values}
+
+def main():
+    print('policy_evaluation.py')
+    for name,gamma in (('4x4',0.9),('10x10',0.8)):
+        V,Q,actions,n_iterations=value_iteration(MAPS[name],gamma)
+        t1=time()
+        result=evaluate_policy_exact(actions,MAPS[name],gamma)
+        t2=time()
+        print('{} map, greedy policy of Q*: win probability {:.4f}, expected episode length {:.2f}, evaluated in {:.2f}ms'.format(name,result['win_probability'],result['expected_length'],1000*(t2-t1)))
+
+if __name__=='__main__':
+    main()
@@ -0,0 +1,54 @@
+import cProfile
+from time import perf_counter_ns
+
+
+# phases of a training step timed by PhaseTimes
+PHASES=('env','action','update','bookkeeping')
+
+# define a class to accumulate the time the training loops spend in each phase, in nanoseconds
+# every step times the environment step (with the reward lookup), the action selection and the Q update,
+# the rest of the episode (reset, decay of epsilon and alpha, metrics, hooks, checkpoints) is counted as bookkeeping
+# the driver of training.py only reads the clock when a PhaseTimes is given, otherwise the timing code is skipped
+class PhaseTimes:
+    def __init__(self):
+        self.ns=dict.fromkeys(PHASES,0)
+        self.steps=0
+        self.episodes=0
+
+    # define a function to add the times of one episode, total_ns is the time of the whole episode
+    def addEpisode(self,env_ns,action_ns,update_ns,total_ns,steps):
+        self.ns['env']+=env_ns
+        self.ns['action']+=action_ns
+        self.ns['update']+=update_ns
+        self.ns['bookkeeping']+=total_ns-env_ns-action_ns-update_ns
+        self.steps+=steps
+        self.episodes+=1
+
+    def totalNs(self):
+        return sum(self.ns.values())
+
+    def stepsPerSec(self):
+        total_ns=self.totalNs()
+        return self.steps*1e9/total_ns if total_ns>0 else 0.0
+
+    # define a function to return the cumulative ns and the share of the time of every phase, and the steps per second
+    def asdict(self):
+        total_ns=self.totalNs()
+        record={}
+        for phase in PHASES:
+            record[phase+'_ns']=self.ns[phase]
+            record[phase+'_share']=self.ns[phase]/total_ns if total_ns>0 else 0.0
+        record['steps_per_sec']=self.stepsPerSec()
+        return record
+
+# clock of the phase timings, in nanoseconds
+clock=perf_counter_ns
+
+# define a function to call function(*args,**kwargs) under cProfile and dump the statistics to path in the pstats format,
+# read with python -m pstats path, or drawn as a flame graph with e.g. flameprof or snakeviz
+def profileCall(path,function,*args,**kwargs):
+    profiler=cProfile.Profile()
+    try:
+        return profiler.runcall(function,*args,**kwargs)
+    finally:
+        profiler.dump_stats(path)
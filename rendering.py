@@ -0,0 +1,63 @@
+import numpy as np
+from tabular import policyToArray
+
+
+# cell of each greedy action left, down, right, up, then of a hole and of the goal, 3 characters each
+CELLS=np.frombuffer(b' <  v  >  ^  H  G ',dtype=np.uint8).reshape(6,3)
+HOLE=4
+GOAL=5
+# end of every row, as print(row,'\n') in the original renderer
+ROW_END=np.frombuffer(b' \n\n',dtype=np.uint8)
+
+# define a function to get the greedy action of every state from a Q table or a policy, as an array or a dict,
+# 1-D arrays are taken as the actions themselves
+def greedyActions(values):
+    values=policyToArray(values)
+    if values.ndim==1:
+        return values
+    return np.argmax(values,axis=1)
+
+# define a function to render the greedy actions of all states as one string, holes and goal marked H and G
+# the cells are looked up from CELLS in one indexing operation, linear in the number of states
+def gridString(values,env_size_tuple,holes=(),goal=()):
+    n_row,n_col=env_size_tuple
+    codes=np.array(greedyActions(values),dtype=np.intp)
+    codes[list(holes)]=HOLE
+    codes[list(goal)]=GOAL
+    grid=np.empty((n_row,3*n_col+len(ROW_END)),dtype=np.uint8)
+    grid[:,:3*n_col]=CELLS[codes].reshape(n_row,3*n_col)
+    grid[:,3*n_col:]=ROW_END
+    return grid.tobytes().decode('ascii')
+
+# define a function to visualize actions taken by the agent in the FrozenLake gridworld
+# values is a Q table or a policy, as an array or a dict, the greedy action of each state is shown,
+# or a 1-D array with the action of each state
+def showGridWorldAction(values,env_size_tuple,holes,goal):
+    print(gridString(values,env_size_tuple,holes,goal),end='')
+
+# define a function to plot the greedy value V=max_a Q of every state as a heatmap with the greedy actions as arrows
+# model is the compiled map, the figure is saved to path if given (e.g. a .png), at most max_arrows arrows per axis are drawn
+def plotGreedyPolicy(Q,model,path=None,max_arrows=50,ax=None):
+    import matplotlib.pyplot as plt
+    Q=np.asarray(Q)
+    n_row,n_col=model.n_row,model.n_col
+    V=Q.max(axis=1).reshape(n_row,n_col)
+    actions=np.argmax(Q,axis=1).reshape(n_row,n_col)
+    if ax is None:
+        fig,ax=plt.subplots(figsize=(6,6*n_row/n_col))
+    else:
+        fig=ax.figure
+    image=ax.imshow(V,cmap='viridis',interpolation='nearest')
+    fig.colorbar(image,ax=ax,label='max Q')
+    # arrows on a subsampled grid of the non terminal states, left, down, right, up in image coordinates
+    step=max(1,-(-max(n_row,n_col)//max_arrows))
+    rows,cols=np.mgrid[0:n_row:step,0:n_col:step]
+    shown=~model.state_terminal.reshape(n_row,n_col)[rows,cols]
+    dx=np.array([-1,0,1,0])[actions[rows,cols]]
+    dy=np.array([0,-1,0,1])[actions[rows,cols]]
+    ax.quiver(cols[shown],rows[shown],dx[shown],dy[shown],color='white',pivot='middle')
+    ax.set_xticks([])
+    ax.set_yticks([])
+    if path is not None:
+        fig.savefig(path,bbox_inches='tight')
+    return fig
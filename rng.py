@@ -0,0 +1,86 @@
+import numpy as np
+
+
+# number of uniform random numbers drawn at once by a random stream
+RANDOM_BLOCK_SIZE=4096
+
+
+# define a function to create the random number generator of a run, a PCG64 Generator from an int seed or a SeedSequence,
+# an existing Generator is returned as is so it can be shared, None gives a generator seeded from the OS
+# a RandomState, the np_random of gym<=0.21 environments, is returned as is as well
+def makeRng(seed=None):
+    if isinstance(seed,(np.random.Generator,np.random.RandomState)):
+        return seed
+    return np.random.Generator(np.random.PCG64(seed))
+
+# define a function to derive an int seed from an int, a SeedSequence or a Generator, for APIs only taking ints as gym's env.seed
+def intSeed(seed):
+    if seed is None or isinstance(seed,(int,np.integer)):
+        return seed
+    if isinstance(seed,np.random.Generator):
+        return int(seed.integers(2**32))
+    if not isinstance(seed,np.random.SeedSequence):
+        seed=np.random.SeedSequence(seed)
+    return int(seed.generate_state(1)[0])
+
+# define functions to get and set the state of a Generator or a RandomState as json serializable values
+def getRngState(rng):
+    if isinstance(rng,np.random.RandomState):
+        state=rng.get_state(legacy=False)
+        state['state']={'key':state['state']['key'].tolist(),'pos':int(state['state']['pos'])}
+        return state
+    return rng.bit_generator.state
+
+def setRngState(rng,state):
+    if isinstance(rng,np.random.RandomState):
+        if not state.get('bit_generator')=='MT19937' or 'has_gauss' not in state:
+            raise ValueError('the saved random state is not the state of a RandomState')
+        state=dict(state,state={'key':np.array(state['state']['key'],dtype=np.uint32),'pos':state['state']['pos']})
+        rng.set_state(state)
+    else:
+        rng.bit_generator.state=state
+
+# define a function to derive n independent generators from a base seed, for runs executed in parallel
+def spawnRngs(seed,n):
+    return [makeRng(s) for s in np.random.SeedSequence(seed).spawn(n)]
+
+# define a class to draw single random numbers from a Generator (or a RandomState) through blocks of pre-generated uniform numbers,
+# calling the Generator once per block instead of once per step
+# random(), randrange(n) and choice(seq) work as the functions of the python random module
+class RandomStream:
+    def __init__(self,rng=None,block_size=RANDOM_BLOCK_SIZE):
+        self.rng=makeRng(rng)
+        self.block_size=block_size
+        # block of pre-generated uniform random numbers and position in the block
+        self._block=[]
+        self._block_pos=0
+
+    # define a function to return the next uniform random number in [0,1)
+    def random(self):
+        if self._block_pos>=len(self._block):
+            self._block=self.rng.random(self.block_size).tolist()
+            self._block_pos=0
+        u=self._block[self._block_pos]
+        self._block_pos+=1
+        return u
+
+    # define a function to return a random integer in [0,n) from a single uniform number
+    def randrange(self,n):
+        return min(int(self.random()*n),n-1)
+
+    # define a function to return a random element of a sequence
+    def choice(self,seq):
+        return seq[self.randrange(len(seq))]
+
+    # define a function to draw an array of uniform random numbers directly from the Generator, e.g. to initialize a Q table
+    def uniform(self,low=0.0,high=1.0,size=None):
+        return self.rng.uniform(low,high,size)
+
+    # define functions to save and restore the position of the stream, the Generator state and the unused part of the block
+    def getState(self):
+        return {'rng':getRngState(self.rng),'block':list(self._block),'block_pos':self._block_pos}
+
+    def setState(self,state):
+        setRngState(self.rng,state['rng'])
+        self._block=list(state['block'])
+        self._block_pos=state['block_pos']
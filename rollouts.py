@@ -0,0 +1,89 @@
+from frozenlake_env import mapOf, randomStream
+from episode_buffer import EpisodeBuffer
+from policy_evaluation import evaluate_policy_exact
+from tabular import policyToArray, policyCDF, sampleAction
+from training import resetEnv, stepEnv
+
+
+# define a function to create epsilon-soft policy
+def createRandomPolicyDict(env):
+    policy={}
+    for state in range(0,env.observation_space.n):
+        p={}
+        for action in range(0,env.action_space.n):
+            p[action]=0.8/env.action_space.n
+        policy[state]=p
+    return policy
+
+# define a function to create action values dictionary
+def createActionValuesDict(env):
+    Q={}
+    for state in range(0,env.observation_space.n):
+        v={}
+        for action in range(0,env.action_space.n):
+            v[action]=0.0
+        Q[state]=v
+    return Q
+
+# define a function to run an episode, policy may be a dict or an array and cdf its precomputed cumulative distribution
+# the episode is stored in episode_buffer, which can be reused across episodes
+# state_reward is the list of rewards of entering each state, derived from the map of env if not given
+# actions are sampled from random_stream, the random stream of env if not given
+# env is reset and stepped through resetEnv and stepEnv of training.py, for every gym api and the array simulator
+def runEpisode(env,policy,cdf=None,episode_buffer=None,metrics=None,state_reward=None,random_stream=None):
+    # precompute the cumulative distribution of the actions of each state
+    if cdf is None:
+        cdf=policyCDF(policyToArray(policy))
+    # reset state to starting state 0 whenever runEpisode is called
+    state=resetEnv(env)
+    # reward of entering each state, looked up instead of testing membership in the holes and goal tuples
+    if state_reward is None:
+        state_reward=mapOf(env).state_reward.tolist()
+    if random_stream is None:
+        random_stream=randomStream(env)
+    # initialize an empty buffer to store sequence of (state,action,reward) in an episode
+    if episode_buffer is None:
+        episode_buffer=EpisodeBuffer()
+    episode_buffer.clear()
+    # flag to indicate whether episode is done i.e. a terminal state is reached
+    done=False
+    # if done flag is False, repeat
+    while not done:
+        # simulate action selection based on policy
+        # sample a probability from uniform distribution
+        prob=random_stream.random()
+        # action a_i is chosen with i is the least i satisfying prob<sum_{i=0}^{i}p_i
+        action=sampleAction(cdf[state],prob)
+        # take action in the environment
+        newstate,done=stepEnv(env,action)
+        # rewards obtained from traversing the environment
+        reward=state_reward[newstate]
+        # count the frisbee in memory if a metrics collector is given
+        if reward==1.0 and metrics is not None:
+            metrics.increment('frisbees')
+        # append the triplet (state,action,reward) to the buffer
+        episode_buffer.append(state,action,reward)
+        state=newstate
+    return episode_buffer
+
+# define function to test policy by the share of n_episodes rollouts reaching the goal,
+# with exact=True the win probability is computed analytically instead, on the compiled map of env with its transitions
+def test_policy(env,policy,exact=False,n_episodes=1000):
+    if exact:
+        return evaluate_policy_exact(policy,mapOf(env))['win_probability']
+    wins=0
+    # precompute the cumulative distribution of the policy once for all episodes
+    cdf=policyCDF(policyToArray(policy))
+    # reuse one episode buffer for all episodes
+    episode_buffer=EpisodeBuffer()
+    # reward of entering each state, derived from the map once
+    state_reward=mapOf(env).state_reward.tolist()
+    # random stream of env, created once for all episodes
+    random_stream=randomStream(env)
+    for i in range(n_episodes):
+        #Calculate reward for each episode
+        w=runEpisode(env,policy,cdf,episode_buffer,state_reward=state_reward,random_stream=random_stream)[-1][-1]
+        #If reward is 1, goal reached and it is a win!
+        if w==1.0:
+            wins+=1
+    return wins/n_episodes
@@ -0,0 +1,41 @@
+import numpy as np
+
+
+# schedules map an episode index to the value of a hyperparameter used during that episode
+
+# define a class for a hyperparameter kept constant over all episodes
+class ConstantSchedule:
+    def __init__(self,value):
+        self.value=value
+
+    def __call__(self,episode):
+        return self.value
+
+    def __repr__(self):
+        return 'ConstantSchedule({})'.format(self.value)
+
+# define a class for a hyperparameter decaying exponentially from maximum to minimum, as epsilon and alpha of the trainers
+# episode 0 uses initial, episode e>0 uses the value decayed after episode e-1
+class ExponentialSchedule:
+    def __init__(self,initial,maximum,minimum,decay_constant):
+        self.initial=initial
+        self.maximum=maximum
+        self.minimum=minimum
+        self.decay_constant=decay_constant
+
+    def __call__(self,episode):
+        if episode==0:
+            return self.initial
+        return self.minimum+(self.maximum-self.minimum)*np.exp(-self.decay_constant*(episode-1))
+
+    def __repr__(self):
+        return 'ExponentialSchedule({}, {}, {}, {})'.format(self.initial,self.maximum,self.minimum,self.decay_constant)
+
+# define functions to create the epsilon and alpha schedules of a training config, same values as config.epsilonAt and config.alphaAt
+def epsilonSchedule(config):
+    return ExponentialSchedule(config.max_epsilon,config.max_epsilon,config.min_epsilon,config.decay_constant)
+
+def alphaSchedule(config):
+    if config.max_alpha==config.min_alpha==config.alpha:
+        return ConstantSchedule(config.alpha)
+    return ExponentialSchedule(config.alpha,config.max_alpha,config.min_alpha,config.decay_constant)
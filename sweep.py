@@ -0,0 +1,100 @@
+import os
+import math
+import itertools
+import contextlib
+import numpy as np
+from time import time
+from concurrent.futures import ProcessPoolExecutor
+from frozenlake_env import makeEnv, MAPS
+from training_config import TrainingConfig, DEFAULT_CONFIGS
+from multi_seed import getTrainer
+
+
+# define a function to expand a grid of hyperparameters {name: [values]} into a list of configs
+def gridSearch(space,base_config=None):
+    if base_config is None:
+        base_config=TrainingConfig()
+    names=list(space)
+    return [base_config.replace(**dict(zip(names,values))) for values in itertools.product(*[space[name] for name in names])]
+
+# define a function to sample n_samples configs at random
+# a list of values is sampled uniformly, a tuple (low,high) from a uniform distribution and (low,high,'log') from a log-uniform distribution
+def randomSearch(space,n_samples,base_config=None,seed=None):
+    if base_config is None:
+        base_config=TrainingConfig()
+    rng=np.random.default_rng(seed)
+    configs=[]
+    for _ in range(n_samples):
+        values={}
+        for name,values_range in space.items():
+            if isinstance(values_range,list):
+                values[name]=values_range[rng.integers(len(values_range))]
+            elif len(values_range)==3 and values_range[2]=='log':
+                values[name]=float(np.exp(rng.uniform(np.log(values_range[0]),np.log(values_range[1]))))
+            else:
+                values[name]=float(rng.uniform(values_range[0],values_range[1]))
+        configs.append(base_config.replace(**values))
+    return configs
+
+# define a function to train one config for n_episodes, executed in a worker process
+# returns the Q table, the frisbee rate and the mean reward over the last window episodes
+def runTrial(trainer,config,n_episodes,seed,desc=None,fast_env=True,Q=None,start_episode=0,window=1000):
+    if desc is None:
+        desc=MAPS['10x10']
+    # the trainers draw from the generator of the environment, seeded once for the whole trial
+    env=makeEnv(desc,fast_env=fast_env,seed=seed)
+    train=getTrainer(trainer)
+    # silence the per-episode output of the trainer
+    with open(os.devnull,'w') as devnull, contextlib.redirect_stdout(devnull):
+        Q,rewards,timesteps,n_frisbees=train(env,n_episodes,config=config,Q=Q,start_episode=start_episode)
+    # rolling frisbee rate of the last window episodes
+    frisbee_rate=float(np.mean(np.asarray(rewards[-window:])==1.0))
+    return Q,frisbee_rate,float(np.mean(rewards[-window:]))
+
+# define a function to run a sweep over configs in parallel, optionally with successive halving
+# with successive halving every config is first trained for min_episodes, then only the best 1/eta configs
+# continue training for eta times more episodes until n_episodes is reached
+def runSweep(configs,trainer='Q_learning_extended',n_episodes=20000,seed=0,desc=None,fast_env=True,max_workers=None,halving=False,min_episodes=1000,eta=3,window=1000):
+    t1=time()
+    # episode budget of every rung
+    if halving:
+        budgets=[]
+        budget=min_episodes
+        while budget<n_episodes:
+            budgets.append(budget)
+            budget=budget*eta
+        budgets.append(n_episodes)
+    else:
+        budgets=[n_episodes]
+    results=[{'config':config,'score':None,'mean_reward':None,'episodes':0,'Q':None} for config in configs]
+    alive=list(range(0,len(configs)))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for rung,budget in enumerate(budgets):
+            futures={}
+            for i in alive:
+                result=results[i]
+                # deterministic seed for every config and rung
+                trial_seed=int(np.random.SeedSequence([seed,i,rung]).generate_state(1)[0])
+                # continue training from the Q table and schedule position reached in the previous rung
+                futures[i]=executor.submit(runTrial,trainer,result['config'],budget-result['episodes'],trial_seed,desc,fast_env,result['Q'],result['episodes'],window)
+            for i,future in futures.items():
+                results[i]['Q'],results[i]['score'],results[i]['mean_reward']=future.result()
+                results[i]['episodes']=budget
+            # keep only the best 1/eta configs for the next rung, ties in frisbee rate are broken by the mean reward
+            if rung<len(budgets)-1:
+                alive=sorted(alive,key=lambda i:(results[i]['score'],results[i]['mean_reward']),reverse=True)[:max(1,math.ceil(len(alive)/eta))]
+    t2=time()
+    print('{} configs swept in {:.3f}s'.format(len(configs),t2-t1))
+    # sort configs from the best to the worst, configs trained for more episodes first
+    return sorted(results,key=lambda result:(result['episodes'],result['score'],result['mean_reward']),reverse=True)
+
+def main():
+    print('sweep.py')
+    space={'gamma':[0.8,0.9,0.99],'decay_constant':[0.001,0.01,0.1],'min_alpha':[0.1,0.5,0.8]}
+    configs=gridSearch(space,DEFAULT_CONFIGS['Q_learning_extended'])
+    results=runSweep(configs,'Q_learning_extended',n_episodes=9000,halving=True,min_episodes=1000,eta=3)
+    for result in results[:5]:
+        print('{} episodes, frisbee rate: {}, {}'.format(result['episodes'],result['score'],result['config']))
+
+if __name__=='__main__':
+    main()
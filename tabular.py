@@ -0,0 +1,40 @@
+import numpy as np
+
+
+# define a function to create epsilon-soft policy as an array of shape (states, actions)
+def createRandomPolicyArray(n_states,n_actions,dtype=np.float64):
+    return np.full((n_states,n_actions),0.8/n_actions,dtype=dtype)
+
+# define a function to create action values array of shape (states, actions)
+def createActionValuesArray(n_states,n_actions,dtype=np.float64):
+    return np.zeros((n_states,n_actions),dtype=dtype)
+
+# define a function to convert a policy or Q given as {state: {action: float}} dict to an array, arrays are returned as they are
+def policyToArray(policy,dtype=np.float64):
+    if isinstance(policy,dict):
+        n_states=len(policy)
+        n_actions=len(next(iter(policy.values())))
+        table=np.zeros((n_states,n_actions),dtype=dtype)
+        for state,p in policy.items():
+            for action,value in p.items():
+                table[state,action]=value
+        return table
+    return np.asarray(policy)
+
+# define a function to convert a policy or Q array back to the {state: {action: float}} dict format
+def policyToDict(policy):
+    return {state:{action:float(value) for action,value in enumerate(row)} for state,row in enumerate(np.asarray(policy))}
+
+# define a function to compute the cumulative distribution of the actions of each state, rows need not sum to 1
+def policyCDF(policy):
+    policy=np.asarray(policy,dtype=np.float64)
+    cdf=np.cumsum(policy,axis=-1)
+    cdf/=cdf[...,-1:]
+    # make sure the last action is always selected for u<1.0 despite rounding errors
+    cdf[...,-1]=1.0
+    return cdf
+
+# define a function to sample an action from the cumulative distribution of a state given a uniform number u in [0,1)
+# action a_i is chosen with i is the least i satisfying u<sum_{i=0}^{i}p_i
+def sampleAction(cdf_row,u):
+    return int(np.searchsorted(cdf_row,u,side='right'))
@@ -0,0 +1,39 @@
+import numpy as np
+from agents import QLambdaAgent
+from schedules import ConstantSchedule
+from training_config import TrainingConfig
+
+
+# define a function to create a greedy Q(lambda) agent on 3 states and 2 actions with a given Q table
+def greedyQLambdaAgent(Q):
+    config=TrainingConfig(gamma=0.9)
+    agent=QLambdaAgent(3,2,config,epsilon=ConstantSchedule(0.0),alpha=ConstantSchedule(0.5),Q=np.array(Q,dtype=np.float64),trace_decay=0.8,rng=0)
+    agent.beginEpisode(0)
+    return agent
+
+# the trace of (0,0) must survive a greedy step into state 0, whose row is updated through the trace itself
+def test_q_lambda_keeps_trace_after_greedy_step():
+    agent=greedyQLambdaAgent([[1.0,0.0],[0.0,0.0],[0.0,0.0]])
+    # step 1: S=0, A=0 loops back to S'=0, the greedy A' is 0
+    agent.update(0,0,0.0,0,False)
+    assert agent.next_action==0
+    assert len(agent.traces)==1
+    assert np.isclose(agent.traces.values[0],0.9*0.8)
+    # delta=0+0.9*1-1=-0.1
+    assert np.isclose(agent.Q[0,0],1.0+0.5*-0.1)
+    # step 2: S=0, A=0 reaches S'=1 with reward 1, the surviving trace of (0,0) is replaced by 1
+    agent.update(0,agent.act(0),1.0,1,True)
+    delta=1.0+0.9*0.0-0.95
+    assert np.isclose(agent.Q[0,0],0.95+0.5*delta)
+
+# the traces are cut after an exploratory step, the next action is not greedy
+def test_q_lambda_cuts_traces_after_exploratory_step():
+    agent=greedyQLambdaAgent([[1.0,0.0],[0.0,2.0],[0.0,0.0]])
+    agent.epsilon=1.0
+    # with epsilon=1 the next action is drawn at random, draw until it is the non greedy action 0 of state 1
+    while True:
+        agent.traces.set(0)
+        agent.update(0,0,0.0,1,False)
+        if agent.next_action==0:
+            break
+    assert len(agent.traces)==0
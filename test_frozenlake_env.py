@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+from frozenlake_env import mapOf
+
+gym=pytest.importorskip('gym')
+
+
+# define a function to move a gym FrozenLake into a hole, an absorbing state with a single outcome per action
+def envInHole(is_slippery):
+    env=gym.make('FrozenLake-v1',is_slippery=is_slippery)
+    env.reset(seed=0)
+    env.unwrapped.s=5
+    return env
+
+# the slipperiness of a gym map is read from its start state, not from the state the last episode ended in
+@pytest.mark.parametrize('is_slippery',[True,False])
+def test_map_of_gym_env_after_episode_end(is_slippery):
+    model=mapOf(envInHole(is_slippery))
+    fresh=mapOf(gym.make('FrozenLake-v1',is_slippery=is_slippery))
+    assert np.array_equal(model.prob,fresh.prob)
+    assert np.array_equal(model.next_state,fresh.next_state)
+    assert (model.prob.shape[2]>1)==is_slippery
@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+from rollouts import runEpisode, test_policy as rolloutWinRate
+from frozenlake_env import ArrayFrozenLake, MAPS
+
+gym=pytest.importorskip('gym')
+
+
+# the rollouts step gym>=0.26 envs, which return terminated and truncated separately, as the array simulator
+def test_run_episode_on_gym_env():
+    env=gym.make('FrozenLake-v1',is_slippery=False,disable_env_checker=True)
+    env.reset(seed=0)
+    # always move right then down: the first row is free, the episode ends in the hole of state 7
+    policy=np.zeros((16,4))
+    policy[:,2]=1.0
+    policy[3]=[0.0,1.0,0.0,0.0]
+    episode=runEpisode(env,policy,random_stream=ArrayFrozenLake(MAPS['4x4'],seed=0).random_stream)
+    assert list(episode.states[:len(episode)])==[0,1,2,3]
+    assert episode.rewards[len(episode)-1]==-1.0
+    assert rolloutWinRate(env,policy,n_episodes=10)==0.0
@@ -0,0 +1,15 @@
+from agents import makeAgent
+from frozenlake_env import ArrayFrozenLake, MAPS
+from metrics import Metrics
+from training import train
+
+
+# any callable stops training, the episode it stopped at is reported in the summary
+def test_train_stops_with_plain_function():
+    env=ArrayFrozenLake(MAPS['4x4'],seed=0)
+    records=[]
+    metrics=Metrics(sinks=[],flush_every=0)
+    metrics.summary=records.append
+    rewards,timesteps=train(makeAgent('Q_learning',env),env,100,metrics=metrics,stop_when=lambda episode,Q,total_rewards:episode==9)
+    assert len(rewards)==10
+    assert {'stopped at episode':9} in records
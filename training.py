@@ -0,0 +1,170 @@
+import os
+import itertools
+import numpy as np
+from time import time
+from frozenlake_env import MAPS, makeEnv, mapOf
+from agents import makeAgent
+from metrics import Metrics
+from checkpoint import saveCheckpoint, loadCheckpoint
+from rendering import showGridWorldAction
+from policy_evaluation import evaluate_policy_exact
+from profiling import clock
+
+
+# define a function to reset an environment and return its start state, for gym and the array simulator
+def resetEnv(env):
+    env.reset()
+    return getattr(env,'unwrapped',env).s
+
+# define a function to take a step in an environment, gym>=0.26 returns terminated and truncated separately
+def stepEnv(env,action):
+    result=env.step(action)
+    if len(result)==5:
+        next_state,reward,terminated,truncated,info=result
+        return next_state,terminated or truncated
+    next_state,reward,done,info=result
+    return next_state,done
+
+# define a function to train any agent on any FrozenLake environment, the single training loop of all algorithms and trainer scripts
+# rewards are looked up from the compiled map of env (+1 goal, -1 hole), each episode is cut after max_steps steps,
+# max_steps=None runs every episode until the environment ends it
+# on_episode(episode,Q) is called after every episode, e.g. to record the distance of Q to Q*,
+# stop_when(episode,Q,total_rewards) stops training once it returns True, an early stopping criterion,
+# the episodes are written to history instead of lists if given and phase_times accumulates the time of every phase
+# the run is saved to checkpoint_path every checkpoint_every episodes and after the last one, with resume=True an existing
+# checkpoint is continued with the Q table, agent state, schedule position, random state and metrics it had
+# returns the rewards and timesteps of every episode, the learned values are in agent.Q
+def train(agent,env,n_episodes=1000,max_steps=100,start_episode=0,metrics=None,on_episode=None,stop_when=None,history=None,
+          checkpoint_path=None,checkpoint_every=1000,resume=False,phase_times=None):
+    t1=time()
+    if metrics is None:
+        metrics=Metrics()
+    # reward of entering each state, a list for fast indexing in the step loop
+    state_reward=mapOf(env).state_reward.tolist()
+    rewards=[]
+    timesteps=[]
+    n_frisbees=0
+    end_episode=start_episode+n_episodes
+    # continue an interrupted run from its checkpoint, a resumed run keeps the histories of the episodes before the checkpoint
+    if resume and checkpoint_path is not None and os.path.exists(checkpoint_path):
+        checkpoint=loadCheckpoint(checkpoint_path)
+        checkpoint.restore(env,metrics,history,agent.random)
+        agent.setState(checkpoint.Q,checkpoint.agent_state)
+        start_episode=checkpoint.episode
+        end_episode=checkpoint.end_episode
+        rewards=checkpoint.rewards
+        timesteps=checkpoint.timesteps
+        n_frisbees=checkpoint.n_frisbees
+    steps_range=range(0,max_steps) if max_steps is not None else itertools.count()
+    # time the phases of every step only when phase_times is given
+    timed=phase_times is not None
+    # episode at which stop_when stopped training, None if it ran to the end
+    stop_episode=None
+    for episode in range(start_episode,end_episode):
+        if timed:
+            episode_start=clock()
+            env_ns=action_ns=update_ns=0
+        agent.beginEpisode(episode)
+        state=resetEnv(env)
+        total_rewards=0
+        steps=0
+        for step in steps_range:
+            steps=steps+1
+            if timed:
+                ns0=clock()
+            action=agent.act(state)
+            if timed:
+                ns1=clock()
+            next_state,done=stepEnv(env,action)
+            reward=state_reward[next_state]
+            if reward==1.0:
+                n_frisbees+=1
+                metrics.increment('frisbees')
+            if timed:
+                ns2=clock()
+            agent.update(state,action,reward,next_state,done)
+            if timed:
+                ns3=clock()
+                action_ns+=ns1-ns0
+                env_ns+=ns2-ns1
+                update_ns+=ns3-ns2
+            total_rewards+=reward
+            state=next_state
+            if done:
+                break
+        # monte carlo learns from the whole episode, counted as update
+        if timed:
+            ns0=clock()
+        agent.endEpisode()
+        if timed:
+            update_ns+=clock()-ns0
+        if history is not None:
+            history.append(total_rewards,steps)
+        else:
+            rewards.append(total_rewards)
+            timesteps.append(steps)
+        if on_episode is not None:
+            on_episode(episode,agent.Q)
+        metrics.record('reward',total_rewards)
+        metrics.record('success',float(total_rewards==1.0))
+        metrics.record('timesteps',steps)
+        metrics.endEpisode(episode)
+        stopped=stop_when is not None and stop_when(episode,agent.Q,total_rewards)
+        # save the state of the run every checkpoint_every episodes and after the last episode,
+        # a stopped run is saved as finished
+        if checkpoint_path is not None and ((episode+1)%checkpoint_every==0 or episode+1==end_episode or stopped):
+            saveCheckpoint(checkpoint_path,agent.Q,episode+1,episode+1 if stopped else end_episode,rewards,timesteps,n_frisbees,agent.config,
+                           env,metrics,history,agent.random,agent.getState())
+        if timed:
+            phase_times.addEpisode(env_ns,action_ns,update_ns,clock()-episode_start,steps)
+        if stopped:
+            stop_episode=episode
+            break
+    t2=time()
+    if history is not None:
+        history.flush()
+        rewards,timesteps=history.rewards,history.timesteps
+    metrics.summary({'agent':type(agent).__name__,
+                     'time':t2-t1,
+                     'frisbees':'{} frisbees obtained in {} episodes'.format(n_frisbees,len(rewards)),
+                     'average timesteps taken':np.mean(timesteps) if len(timesteps) else 0.0,
+                     'score over time':sum(rewards)/len(rewards) if len(rewards) else 0.0})
+    if stop_when is not None:
+        metrics.summary({'stopped at episode':stop_episode})
+    if timed:
+        metrics.summary(phase_times.asdict())
+    return rewards,timesteps
+
+# runs of the trainer scripts, name, agent, map and number of episodes
+RUNS=(('mc','mc','4x4',1000),
+      ('sarsa','sarsa','4x4',1000),
+      ('Q_learning','Q_learning','4x4',1000),
+      ('mc_extended','mc','10x10',20000),
+      ('sarsa_extended','sarsa','10x10',20000),
+      ('Q_learning_extended','Q_learning','10x10',20000),
+      ('expected_sarsa','expected_sarsa','4x4',1000),
+      ('double_Q_learning','double_Q_learning','4x4',1000),
+      ('expected_sarsa_extended','expected_sarsa','10x10',20000),
+      ('double_Q_learning_extended','double_Q_learning','10x10',20000),
+      ('sarsa_lambda','sarsa_lambda','4x4',1000),
+      ('Q_lambda','Q_lambda','4x4',1000),
+      ('sarsa_lambda_extended','sarsa_lambda','10x10',20000),
+      ('Q_lambda_extended','Q_lambda','10x10',20000),
+      ('dyna_Q','dyna_Q','4x4',1000),
+      ('dyna_Q_extended','dyna_Q','10x10',20000))
+# runs executed by main.py by default, the ones of the six trainer scripts
+DEFAULT_RUNS=('mc','sarsa','Q_learning','mc_extended','sarsa_extended','Q_learning_extended')
+
+# define a function to train an agent by name on a named map, report the exact win probability of its greedy policy and show it
+def run(agent_name,map_name='4x4',n_episodes=1000,fast_env=False,metrics=None,seed=None,render=True,**kwargs):
+    if metrics is None:
+        metrics=Metrics()
+    # one generator for the run, shared by the environment and the agent
+    env=makeEnv(MAPS[map_name],fast_env=fast_env,seed=seed)
+    agent=makeAgent(agent_name,env,extended=map_name!='4x4')
+    rewards,timesteps=train(agent,env,n_episodes,metrics=metrics,**kwargs)
+    model=mapOf(env)
+    metrics.summary({'win probability':evaluate_policy_exact(agent.greedyPolicy(),model)['win_probability']})
+    if render:
+        showGridWorldAction(agent.greedyPolicy(),(model.n_row,model.n_col),model.holes,model.goal)
+    return agent,rewards,timesteps
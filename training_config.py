@@ -0,0 +1,61 @@
+import numpy as np
+
+
+# define a class to hold the hyperparameters of the temporal difference trainers
+class TrainingConfig:
+    # names of the hyperparameters, in the order they are printed
+    FIELDS=('gamma','alpha','max_alpha','min_alpha','max_epsilon','min_epsilon','decay_constant')
+
+    def __init__(self,gamma=0.9,alpha=0.8,max_alpha=0.8,min_alpha=0.8,max_epsilon=1.0,min_epsilon=0.01,decay_constant=0.001):
+        # discount factor
+        self.gamma=gamma
+        # learning rate of the first episode
+        self.alpha=alpha
+        # upper and lower bound of the learning rate in later episodes
+        self.max_alpha=max_alpha
+        self.min_alpha=min_alpha
+        # upper and lower bound for epsilon, epsilon of the first episode is max_epsilon
+        self.max_epsilon=max_epsilon
+        self.min_epsilon=min_epsilon
+        # decay rate constant of epsilon and alpha
+        self.decay_constant=decay_constant
+
+    # define a function to return a copy of the config with some hyperparameters changed
+    def replace(self,**changes):
+        values=self.asdict()
+        for name in changes:
+            if name not in self.FIELDS:
+                raise TypeError('unknown hyperparameter: {}'.format(name))
+        values.update(changes)
+        return TrainingConfig(**values)
+
+    def asdict(self):
+        return {name:getattr(self,name) for name in self.FIELDS}
+
+    # epsilon used during a given episode, episode e>0 uses the value decayed after episode e-1
+    def epsilonAt(self,episode):
+        if episode==0:
+            return self.max_epsilon
+        return self.min_epsilon+(self.max_epsilon-self.min_epsilon)*np.exp(-self.decay_constant*(episode-1))
+
+    # learning rate used during a given episode
+    def alphaAt(self,episode):
+        if episode==0:
+            return self.alpha
+        return self.min_alpha+(self.max_alpha-self.min_alpha)*np.exp(-self.decay_constant*(episode-1))
+
+    def __eq__(self,other):
+        return isinstance(other,TrainingConfig) and self.asdict()==other.asdict()
+
+    def __repr__(self):
+        return 'TrainingConfig({})'.format(', '.join('{}={}'.format(name,getattr(self,name)) for name in self.FIELDS))
+
+# hyperparameters previously hard-coded in each trainer
+DEFAULT_CONFIGS={'sarsa':TrainingConfig(),
+                 'Q_learning':TrainingConfig(),
+                 'sarsa_extended':TrainingConfig(gamma=0.8,alpha=1.0,max_alpha=1.0,min_alpha=0.8,min_epsilon=0.001,decay_constant=0.1),
+                 'Q_learning_extended':TrainingConfig(gamma=0.8,alpha=0.8,max_alpha=1.0,min_alpha=0.8,min_epsilon=0.001,decay_constant=0.001)}
+# the variants of the agents start from the hyperparameters of sarsa or Q-learning
+for name,base in (('expected_sarsa','Q_learning'),('double_Q_learning','Q_learning'),('sarsa_lambda','sarsa'),('Q_lambda','Q_learning'),('dyna_Q','Q_learning')):
+    DEFAULT_CONFIGS[name]=DEFAULT_CONFIGS[base]
+    DEFAULT_CONFIGS[name+'_extended']=DEFAULT_CONFIGS[base+'_extended']